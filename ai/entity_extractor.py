@@ -3,20 +3,152 @@ Entity Extractor module for GraphNet.
 Uses LangChain and Google Gemini to extract entities and relationships from text.
 """
 
+import asyncio
 import logging
 import json
+import random
 import re
-import time  # For rate-limit protection
-from typing import List, Dict, Any, Tuple
+import threading
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Iterable, Iterator
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from config import config
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import tiktoken
+except ImportError:  # Optional: token-accurate prompt truncation
+    tiktoken = None
+try:  # google-api-core ships with older langchain-google-genai releases
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    google_exceptions = None
+try:  # langchain-google-genai 4.x raises Gemini 429s and 5xx as these
+    from langchain_google_genai.chat_models import GoogleRateLimitError, ServerError
+except ImportError:
+    GoogleRateLimitError = ServerError = None
+
 logger = logging.getLogger(__name__)
 
+# Transient failures worth retrying with backoff; anything else (bad API key,
+# permission denied, malformed reply) fails the batch on the first attempt
+_RETRYABLE_ERRORS: Tuple[type, ...] = (TimeoutError, asyncio.TimeoutError, ConnectionError)
+if google_exceptions is not None:
+    _RETRYABLE_ERRORS += (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+if GoogleRateLimitError is not None:
+    _RETRYABLE_ERRORS += (GoogleRateLimitError, ServerError)
+
+# The Gemini client and tokenizer are shared across EntityExtractor instances
+# and re-initialization, so a second GraphNet in the process doesn't rebuild them
+_INIT_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _cached_llm(model: str, api_key: str) -> ChatGoogleGenerativeAI:
+    return ChatGoogleGenerativeAI(model=model, temperature=0, google_api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _cached_encoding():
+    # Gemini has no local tokenizer; cl100k_base is a close approximation
+    return tiktoken.get_encoding("cl100k_base")
+
+# Patterns used by SimpleEntityExtractor
+_ORG_PATTERN = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Inc|Corp|LLC|Ltd|Company)\b'
+_PERSON_PATTERN = r'\b(?:Mr|Mrs|Ms|Dr|Prof)\.\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
+_DATE_PATTERN = (
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
+    r'|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
+)
+
+# Compiled once; each pattern scans the text separately, since matches of
+# different types may overlap ("Dr. Smith Company" is a Person and an Organization)
+_ORG_RE = re.compile(_ORG_PATTERN)
+_PERSON_RE = re.compile(_PERSON_PATTERN)
+_DATE_RE = re.compile(_DATE_PATTERN)
+
+
+def _extract_basic(text: str) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Basic entity matcher.
+
+    Returns:
+        Deduplicated (organizations, persons, dates), each in first-seen order
+    """
+    return tuple(
+        list(dict.fromkeys(match.group() for match in pattern.finditer(text)))
+        for pattern in (_ORG_RE, _PERSON_RE, _DATE_RE)
+    )
+
+
+_EXTRACTION_SYSTEM_PROMPT = """You are an expert at extracting entities and relationships from text.
+
+Extract all relevant entities (people, organizations, locations, concepts, products, dates, etc.) 
+and their relationships from the given text.
+
+The text may contain several chunks separated by ===CHUNK N=== markers; extract from all of them
+into the single JSON object described below.
+
+Entity types should be one of: Person, Organization, Location, Concept, Product, Date, Event, Technology, or Other.
+
+Relationship types should be descriptive (e.g., WORKS_FOR, LOCATED_IN, RELATED_TO, OWNS, CREATED, MANAGES, PARTICIPATED_IN).
+
+Return your response as a JSON object with this EXACT structure:
+{{
+    "entities": [
+        {{"name": "Entity Name", "type": "Person", "description": "Brief description"}},
+        ...
+    ],
+    "relationships": [
+        {{"source": "Entity1", "target": "Entity2", "type": "WORKS_FOR", "description": "Brief description"}},
+        ...
+    ]
+}}
+
+Be thorough but precise. Only extract entities and relationships that are clearly mentioned or strongly implied in the text.
+Return ONLY the JSON object, no other text."""
+
+
+class TokenBucket:
+    """
+    Asyncio token-bucket rate limiter.
+
+    Holds up to `rate_per_minute` tokens and refills continuously, so callers
+    run at the configured ceiling instead of sleeping a fixed amount per call.
+    One bucket is shared by concurrent uploads, each running its own event
+    loop in its own thread, so the refill-and-consume step is guarded by a
+    threading lock; waiting for tokens happens outside it.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = float(max(1, rate_per_minute))
+        self.tokens = self.capacity
+        self.fill_rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` tokens are available, then consume them"""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.fill_rate
+            await asyncio.sleep(wait)
+
 
 class Entity(BaseModel):
     """Entity model"""
@@ -46,6 +178,10 @@ class EntityExtractor:
         """Initialize the entity extractor with LangChain"""
         self.llm = None
         self.initialized = False
+        self._prompt_template = None
+        self._encoding = None
+        self._request_limiter = None
+        self._token_limiter = None
 
     def initialize(self) -> bool:
         """
@@ -59,12 +195,23 @@ class EntityExtractor:
                 logger.error("Google API key not configured")
                 return False
 
-                # Switch to Google Gemini
-            self.llm = ChatGoogleGenerativeAI(
-                model=config.AI_MODEL,
-                temperature=0,
-                google_api_key=config.GOOGLE_API_KEY
-            )
+            # Switch to Google Gemini
+            with _INIT_LOCK:
+                self.llm = _cached_llm(config.AI_MODEL, config.GOOGLE_API_KEY)
+            # Build the extraction prompt once rather than per chunk
+            self._prompt_template = ChatPromptTemplate.from_messages([
+                ("system", _EXTRACTION_SYSTEM_PROMPT),
+                ("user", "Context: {context}\n\nText to analyze:\n{text}")
+            ])
+            self._request_limiter = TokenBucket(config.LLM_RPM)
+            self._token_limiter = TokenBucket(config.LLM_TPM)
+
+            if tiktoken:
+                try:
+                    with _INIT_LOCK:
+                        self._encoding = _cached_encoding()
+                except Exception as e:
+                    logger.warning(f"Could not load tokenizer, truncating by characters: {str(e)}")
 
             self.initialized = True
             logger.info("Entity extractor initialized with Gemini")
@@ -73,6 +220,86 @@ class EntityExtractor:
             logger.error(f"Failed to initialize: {str(e)}")
             return False
 
+    def _truncate(self, text: str) -> str:
+        """Limit text to MAX_INPUT_TOKENS tokens (about 4 characters per token without a tokenizer)"""
+        limit = config.MAX_INPUT_TOKENS
+        if self._encoding is None:
+            return text[:limit * 4]
+
+        tokens = self._encoding.encode(text)
+        if len(tokens) <= limit:
+            return text
+        return self._encoding.decode(tokens[:limit])
+
+    def _count_tokens(self, text: str) -> int:
+        """Token count of text (about 4 characters per token without a tokenizer)"""
+        if self._encoding is None:
+            return len(text) // 4
+        return len(self._encoding.encode(text))
+
+    def _build_messages(self, text: str, context: str = None, truncate: bool = True):
+        """Build the extraction prompt messages for a piece of text"""
+        # Format the prompt
+        return self._prompt_template.format_messages(
+            context=context or "Unknown source",
+            text=self._truncate(text) if truncate else text  # Limit text length for API
+        )
+
+    def _iter_batches(self, chunks: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+        """
+        Pack consecutive chunks into prompts of at most LLM_BATCH_TOKENS tokens,
+        so the fixed system prompt is paid once per batch rather than per chunk.
+
+        Yields:
+            (index of first chunk, number of chunks, combined text) tuples
+        """
+        batch = []
+        batch_tokens = 0
+        first_index = 0
+
+        for index, chunk in enumerate(chunks):
+            chunk = self._truncate(chunk)
+            tokens = self._count_tokens(chunk)
+            if batch and batch_tokens + tokens > config.LLM_BATCH_TOKENS:
+                yield first_index, len(batch), "\n\n".join(batch)
+                batch = []
+                batch_tokens = 0
+            if not batch:
+                first_index = index
+            batch.append(f"===CHUNK {index + 1}===\n{chunk}")
+            batch_tokens += tokens
+
+        if batch:
+            yield first_index, len(batch), "\n\n".join(batch)
+
+    @staticmethod
+    def _parse_response(response) -> Dict[str, Any]:
+        """Parse the LLM response into entities and relationships"""
+        response_text = response.content.strip()
+
+        # Remove markdown code blocks if present
+        response_text = re.sub(r'```json\s*', '', response_text)
+        response_text = re.sub(r'```\s*', '', response_text)
+        response_text = response_text.strip()
+
+        # Parse JSON
+        try:
+            result_dict = json.loads(response_text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            return {
+                "entities": [],
+                "relationships": [],
+                "success": False,
+                "error": "Failed to parse LLM response"
+            }
+
+        return {
+            "entities": result_dict.get('entities', []),
+            "relationships": result_dict.get('relationships', []),
+            "success": True
+        }
+
     def extract_entities_and_relationships(self, text: str, context: str = None) -> Dict[str, Any]:
         """
         Extract entities and relationships from text
@@ -89,68 +316,12 @@ class EntityExtractor:
             return {"entities": [], "relationships": [], "error": "Not initialized"}
 
         try:
-            # Create the extraction prompt
-            prompt_template = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert at extracting entities and relationships from text.
-
-Extract all relevant entities (people, organizations, locations, concepts, products, dates, etc.) 
-and their relationships from the given text.
-
-Entity types should be one of: Person, Organization, Location, Concept, Product, Date, Event, Technology, or Other.
-
-Relationship types should be descriptive (e.g., WORKS_FOR, LOCATED_IN, RELATED_TO, OWNS, CREATED, MANAGES, PARTICIPATED_IN).
-
-Return your response as a JSON object with this EXACT structure:
-{{
-    "entities": [
-        {{"name": "Entity Name", "type": "Person", "description": "Brief description"}},
-        ...
-    ],
-    "relationships": [
-        {{"source": "Entity1", "target": "Entity2", "type": "WORKS_FOR", "description": "Brief description"}},
-        ...
-    ]
-}}
-
-Be thorough but precise. Only extract entities and relationships that are clearly mentioned or strongly implied in the text.
-Return ONLY the JSON object, no other text."""),
-                ("user", "Context: {context}\n\nText to analyze:\n{text}")
-            ])
-
-            # Format the prompt
-            messages = prompt_template.format_messages(
-                context=context or "Unknown source",
-                text=text[:4000]  # Limit text length for API
-            )
+            messages = self._build_messages(text, context)
 
             # Get response from LLM
             response = self.llm.invoke(messages)
 
-            # Parse the JSON response
-            response_text = response.content.strip()
-
-            # Remove markdown code blocks if present
-            response_text = re.sub(r'```json\s*', '', response_text)
-            response_text = re.sub(r'```\s*', '', response_text)
-            response_text = response_text.strip()
-
-            # Parse JSON
-            try:
-                result_dict = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                return {
-                    "entities": [],
-                    "relationships": [],
-                    "success": False,
-                    "error": "Failed to parse LLM response"
-                }
-
-            return {
-                "entities": result_dict.get('entities', []),
-                "relationships": result_dict.get('relationships', []),
-                "success": True
-            }
+            return self._parse_response(response)
 
         except Exception as e:
             logger.error(f"Error extracting entities: {str(e)}")
@@ -161,40 +332,108 @@ Return ONLY the JSON object, no other text."""),
                 "error": str(e)
             }
 
-    def extract_from_chunks(self, chunks: List[str], context: str = None) -> Dict[str, Any]:
+    async def _aextract(self, text: str, context: str = None, truncate: bool = True) -> Dict[str, Any]:
         """
-        Extract entities and relationships from multiple text chunks
-        with built-in rate-limit protection.
+        Async variant of extract_entities_and_relationships.
+        Calls are paced by the request/token buckets; transient failures (rate
+        limits, server errors, timeouts) are retried with exponential backoff
+        and jitter, up to LLM_MAX_RETRIES attempts (at least one).
         """
-        all_entities = {}
-        all_relationships = []
+        messages = self._build_messages(text, context, truncate)
+        # Rough prompt size estimate (~4 characters per token)
+        prompt_tokens = sum(len(message.content) for message in messages) // 4
+
+        attempts = max(1, config.LLM_MAX_RETRIES)
+        for attempt in range(attempts):
+            try:
+                await self._request_limiter.acquire()
+                await self._token_limiter.acquire(prompt_tokens)
+                response = await self.llm.ainvoke(messages)
+                return self._parse_response(response)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == attempts - 1:
+                    error = e
+                    break
+                delay = min(2 ** attempt, 30) + random.uniform(0, 1)
+                logger.warning(f"LLM call failed ({str(e)}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                error = e
+                break
+
+        logger.error(f"Error extracting entities: {str(error)}")
+        return {
+            "entities": [],
+            "relationships": [],
+            "success": False,
+            "error": str(error)
+        }
+
+    async def _aextract_all(self, chunks: Iterable[str], context: str = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Run extraction over all chunk batches with at most LLM_CONCURRENCY calls in flight.
+
+        Workers pull from a shared batch iterator, so only the batches currently
+        being processed need to exist at once when chunks is a generator.
+
+        Returns:
+            Per-batch results in chunk order, and the number of chunks processed
+        """
+        results = {}
+        chunk_count = 0
+        pending = self._iter_batches(chunks)
 
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}")
+        async def worker():
+            nonlocal chunk_count
+            for first_index, count, batch_text in pending:
+                logger.info(f"Processing chunks {first_index + 1}-{first_index + count}")
+                chunk_count += count
+                results[first_index] = await self._aextract(batch_text, context, truncate=False)
 
-            result = self.extract_entities_and_relationships(chunk, context)
+        await asyncio.gather(*(worker() for _ in range(max(1, config.LLM_CONCURRENCY))))
+        return [results[index] for index in sorted(results)], chunk_count
 
+    def extract_from_chunks(self, chunks: Iterable[str], context: str = None) -> Dict[str, Any]:
+        """
+        Extract entities and relationships from multiple text chunks.
+        Chunks may be any iterable (e.g. DocumentProcessor.iter_chunks). They are
+        packed into batches of up to LLM_BATCH_TOKENS tokens per LLM call, and
+        batches are sent concurrently, at most LLM_CONCURRENCY at a time, paced
+        to the LLM_RPM/LLM_TPM quota.
+        """
+        if not self.initialized:
+            logger.error("Entity extractor not initialized")
+            return {"entities": [], "relationships": [], "error": "Not initialized"}
+
+        all_entities = []
+        seen_entities = set()
+        all_relationships = []
+        seen_relationships = set()
+
+        results, chunk_count = asyncio.run(self._aextract_all(chunks, context))
+
+        for result in results:
             if result.get("success"):
                 # Aggregate entities (avoid duplicates)
                 for entity in result.get("entities", []):
-                    entity_key = f"{entity['name']}_{entity['type']}"
-                    if entity_key not in all_entities:
-                        all_entities[entity_key] = entity
-
-                # Collect relationships
-                all_relationships.extend(result.get("relationships", []))
-
-            # --- RATE LIMIT PROTECTION ---
-            # If processing more than one chunk, add a delay to avoid 429 errors
-            if i < len(chunks) - 1:
-                logger.info("Waiting 2 seconds to avoid API rate limits...")
-                time.sleep(2)
+                    entity_key = (entity['name'], entity['type'])
+                    if entity_key not in seen_entities:
+                        seen_entities.add(entity_key)
+                        all_entities.append(entity)
+
+                # Collect relationships; one mentioned in several chunks would
+                # otherwise be written (and MERGEd) once per mention
+                for rel in result.get("relationships", []):
+                    rel_key = (rel.get('source'), rel.get('target'), rel.get('type'))
+                    if rel_key not in seen_relationships:
+                        seen_relationships.add(rel_key)
+                        all_relationships.append(rel)
 
         return {
-            "entities": list(all_entities.values()),
+            "entities": all_entities,
             "relationships": all_relationships,
             "success": True,
-            "chunks_processed": len(chunks)
+            "chunks_processed": chunk_count
         }
 
     def simple_extract(self, text: str) -> Tuple[List[Dict], List[Dict]]:
@@ -216,37 +455,16 @@ class SimpleEntityExtractor:
         Extract basic entities using simple pattern matching
         This is a fallback when LLM is not available
         """
-        entities = []
+        orgs, persons, dates = _extract_basic(text)
 
-        # Organization names (capitalized words followed by Inc, Corp, etc.)
-        org_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Inc|Corp|LLC|Ltd|Company)\b'
-        orgs = re.findall(org_pattern, text)
-        for org in set(orgs):
-            entities.append({
-                "name": org,
-                "type": "Organization",
-                "description": f"Organization mentioned in text"
-            })
-
-        # Person names (Title + Capitalized Name)
-        person_pattern = r'\b(?:Mr|Mrs|Ms|Dr|Prof)\.\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-        persons = re.findall(person_pattern, text)
-        for person in set(persons):
-            entities.append({
-                "name": person,
-                "type": "Person",
-                "description": f"Person mentioned in text"
-            })
-
-        # Dates
-        date_pattern = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
-        dates = re.findall(date_pattern, text)
-        for date in set(dates):
-            entities.append({
-                "name": date,
-                "type": "Date",
-                "description": f"Date mentioned in text"
-            })
+        entities = []
+        for entity_type, names in (("Organization", orgs), ("Person", persons), ("Date", dates)):
+            for name in names:
+                entities.append({
+                    "name": name,
+                    "type": entity_type,
+                    "description": f"{entity_type} mentioned in text"
+                })
 
         return {
             "entities": entities,
@@ -3,18 +3,293 @@ Query Agent module for GraphNet.
 Handles natural language queries and generates Cypher queries for Neo4j.
 """
 
+import asyncio
+import bisect
+import copy
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import SystemMessage
 from config import config
 from graph.graph_manager import GraphManager
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+try:  # google-api-core ships with older langchain-google-genai releases
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    google_exceptions = None
+try:
+    from langchain_google_genai.chat_models import ChatGoogleGenerativeAIError
+except ImportError:
+    ChatGoogleGenerativeAIError = None
+try:  # langchain-google-genai 4.x raises Gemini 429s and 5xx as these
+    from langchain_google_genai.chat_models import GoogleRateLimitError, ServerError
+except ImportError:
+    GoogleRateLimitError = ServerError = None
+
 logger = logging.getLogger(__name__)
 
+# Transient failures worth retrying with backoff
+_RETRYABLE_ERRORS: Tuple[type, ...] = (TimeoutError, ConnectionError)
+if google_exceptions is not None:
+    _RETRYABLE_ERRORS += (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+if GoogleRateLimitError is not None:
+    _RETRYABLE_ERRORS += (GoogleRateLimitError, ServerError)
+
+# Everything an LLM call (or parsing its reply) is expected to raise
+_LLM_ERRORS: Tuple[type, ...] = _RETRYABLE_ERRORS + (ValueError,)
+if google_exceptions is not None:
+    _LLM_ERRORS += (google_exceptions.GoogleAPIError,)
+if ChatGoogleGenerativeAIError is not None:
+    _LLM_ERRORS += (ChatGoogleGenerativeAIError,)
+
+# Shared pool for independent graph lookups; the drivers release the GIL
+# while waiting on I/O
+_GRAPH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1),
+    thread_name_prefix="graphnet-query"
+)
+
+# Clients are shared across QueryAgent instances and re-initialization so the
+# underlying HTTP session and connection pool are reused
+_LLM_LOCK = threading.Lock()
+
+@lru_cache(maxsize=4)
+def _cached_llm(model: str, api_key: str, response_mime_type: Optional[str],
+                cached_content: Optional[str]) -> ChatGoogleGenerativeAI:
+    options = {"response_mime_type": response_mime_type} if response_mime_type else {}
+    if cached_content:
+        options["cached_content"] = cached_content
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=0,
+        google_api_key=api_key,
+        **options
+    )
+
+def _make_llm(model: str, api_key: str, response_mime_type: Optional[str] = None,
+              cached_content: Optional[str] = None) -> ChatGoogleGenerativeAI:
+    """
+    Return the shared Gemini client for (model, api_key), creating it on first use.
+    Pass response_mime_type="application/json" for a client in JSON output mode,
+    and cached_content for one that reuses a Gemini context cache.
+    """
+    with _LLM_LOCK:
+        return _cached_llm(model, api_key, response_mime_type, cached_content)
+
+# Search term in generated Cypher, e.g. CONTAINS "Acme", {name: "Acme"} or name = "Acme"
+_SEARCH_TERM_RE = re.compile(r'(?:CONTAINS|name\s*:|name\s*=)\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Markdown code fences the model sometimes wraps its reply in
+_FENCE_RE = re.compile(r"^```(?:json|cypher)?\s*|\s*```\s*$", re.MULTILINE)
+
+# Node properties kept when result rows are summarized for the explainer prompt
+_COMPACT_KEYS = ("name", "type", "id")
+_COMPACT_MAX_CHARS = 80
+
+def _compact_value(value: Any) -> Any:
+    """Reduce a result value to the fields the explainer needs"""
+    if isinstance(value, dict):
+        return {key: _compact_value(value[key]) for key in _COMPACT_KEYS if key in value}
+    if isinstance(value, (list, tuple)):
+        return [_compact_value(item) for item in value[:3]]
+    if isinstance(value, str) and len(value) > _COMPACT_MAX_CHARS:
+        return value[:_COMPACT_MAX_CHARS] + "..."
+    return value
+
+def _compact(row: Dict) -> Dict:
+    """Compact one result row: nodes keep only name/type/id, long strings are truncated"""
+    return {key: _compact_value(value) for key, value in row.items()}
+
+# Prompt templates are static, so they are built once at import time and only
+# formatted per request
+_CYPHER_SYSTEM_PROMPT = """You are an expert at converting natural language questions 
+into Neo4j Cypher queries. Each user message is one question to convert to Cypher.
+
+Common patterns:
+- Find entity: MATCH (e:Type {name: "EntityName"}) RETURN e
+- Find relationships: MATCH (e1)-[r]->(e2) WHERE e1.name = "Name" RETURN e1, r, e2
+- Search: MATCH (e) WHERE e.name CONTAINS "SearchTerm" RETURN e
+- Count: MATCH (n:Type) RETURN count(n)
+- Get related: MATCH (e {name: "Name"})-[r]-(other) RETURN other
+
+Entity types in the graph: Person, Organization, Location, Concept, Product, Date, Event, Technology
+Relationship types: WORKS_FOR, LOCATED_IN, RELATED_TO, OWNS, CREATED, MANAGES, PARTICIPATED_IN
+
+Return ONLY a JSON object, without markdown formatting, with this exact structure:
+{"cypher": "<the Cypher query>", "result_template": "<one sentence describing the results>"}
+
+The result_template is shown to the user after the query runs. Write {count} where the number
+of results goes and {sample} where example results go; use no other braces."""
+
+# The human turn is only the raw question, so everything before it is a
+# byte-identical prefix across calls for provider-side prompt caching
+_CYPHER_QUESTION_TEMPLATE = ("human", "{question}")
+
+_CYPHER_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_CYPHER_SYSTEM_PROMPT),
+    _CYPHER_QUESTION_TEMPLATE
+])
+
+# Used when the system prompt lives in a Gemini context cache
+_CYPHER_QUESTION_PROMPT = ChatPromptTemplate.from_messages([_CYPHER_QUESTION_TEMPLATE])
+
+_EXPLAIN_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content="""You are explaining query results from a knowledge graph. 
+Provide a clear, concise explanation of what was found. Be specific and mention entity names.
+Give a brief, natural explanation of the results described in the user message."""),
+    ("human", """
+Original question: {natural_query}
+
+Query executed: {cypher_query}
+
+Results found: {result_count}
+
+Sample results: {sample_results}""")
+])
+
+_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content="""You are summarizing information about an entity from a knowledge graph.
+Provide a clear, informative summary mentioning the entity's properties and key relationships.
+Give a brief summary of the entity described in the user message and its connections."""),
+    ("human", """
+Entity: {entity_name}
+Properties: {entity_data}
+Relationships: {relationships}""")
+])
+
+# Offline fast path: frequent question shapes map straight to the canonical
+# Cypher patterns above, skipping the generation LLM call
+_ENTITY_TYPES = ("Person", "Organization", "Location", "Concept", "Product", "Date", "Event", "Technology")
+_TYPE_LABELS = {alias: label for label in _ENTITY_TYPES for alias in (label.lower(), label.lower() + "s")}
+_TYPE_LABELS.update({"people": "Person", "technologies": "Technology"})
+
+def _cypher_string(value: str) -> str:
+    """Quote a value as a Cypher string literal"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _template_text(value: str) -> str:
+    """Escape a value for use inside a result template"""
+    return value.replace("{", "{{").replace("}", "}}")
+
+def _all_entities_plan(match: "re.Match") -> Optional[Tuple[str, Optional[str]]]:
+    return "MATCH (n) RETURN n", "Found {count} entities in the graph."
+
+def _count_plan(match: "re.Match") -> Optional[Tuple[str, Optional[str]]]:
+    label = _TYPE_LABELS.get(match.group("type").lower())
+    if not label:
+        return None
+    return f"MATCH (n:{label}) RETURN count(n) AS count", None
+
+def _list_type_plan(match: "re.Match") -> Optional[Tuple[str, Optional[str]]]:
+    label = _TYPE_LABELS.get(match.group("type").lower())
+    if not label:
+        return None
+    return f"MATCH (n:{label}) RETURN n", f"Found {{count}} {label} entities in the graph."
+
+def _named_entity_plan(match: "re.Match") -> Optional[Tuple[str, Optional[str]]]:
+    label = _TYPE_LABELS.get(match.group("type").lower())
+    if not label:
+        return None
+    name = match.group("name").strip("\"' ")
+    return (
+        f"MATCH (n:{label} {{name: {_cypher_string(name)}}}) RETURN n",
+        f"Found {{count}} {label} entities named {_template_text(name)}."
+    )
+
+def _relationships_plan(match: "re.Match") -> Optional[Tuple[str, Optional[str]]]:
+    name = match.group("name").strip("\"' ")
+    return (
+        f"MATCH (e {{name: {_cypher_string(name)}}})-[r]-(other) RETURN e, r, other",
+        f"Found {{count}} relationships for {_template_text(name)}."
+    )
+
+# (pattern, plan builder) pairs tried in order against the whole question; a
+# builder returning None lets later rules and finally the LLM handle it
+_FASTPATH_RULES = [
+    (re.compile(r"(?:show|list|find|get)(?: me)? all(?: the)? (?:entities|nodes)", re.IGNORECASE),
+     _all_entities_plan),
+    (re.compile(r"(?:count|how many)(?: all)?(?: the)? (?P<type>\w+)(?: are there)?(?: in the graph)?",
+                re.IGNORECASE),
+     _count_plan),
+    (re.compile(r"(?:show|list|find|get)(?: me)? all(?: the)? (?P<type>\w+)(?: in the graph)?", re.IGNORECASE),
+     _list_type_plan),
+    (re.compile(r"find(?: the)? (?P<type>\w+) (?:named|called) (?P<name>.+)", re.IGNORECASE),
+     _named_entity_plan),
+    (re.compile(r"(?:what are the |show(?: me)? the )?relationships (?:for|of) (?P<name>.+)", re.IGNORECASE),
+     _relationships_plan),
+]
+
+def _fast_path_plan(natural_language_query: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(cypher, result template) from the first matching fast-path rule, or None"""
+    question = natural_language_query.strip().rstrip("?.!").strip()
+    for pattern, build_plan in _FASTPATH_RULES:
+        match = pattern.fullmatch(question)
+        if match:
+            plan = build_plan(match)
+            if plan:
+                return plan
+    return None
+
+class SuggestionIndex:
+    """
+    Case-insensitive substring index over query suggestions.
+
+    Every suffix of every lowercased suggestion is kept in one sorted list, so
+    the suggestions containing a query are the suffixes that start with it: a
+    contiguous range found by binary search in O(log N + hits), independent of
+    catalog size. Build a new index when the suggestion catalog changes.
+    """
+
+    def __init__(self, suggestions: List[str]):
+        self.suggestions = list(suggestions)
+        entries = sorted(
+            (lowered[start:], index)
+            for index, lowered in enumerate(s.lower() for s in self.suggestions)
+            for start in range(len(lowered))
+        )
+        self._suffixes = [suffix for suffix, _ in entries]
+        self._owners = [index for _, index in entries]
+
+    def search(self, partial_query: str, limit: int = 5) -> List[str]:
+        """Suggestions containing partial_query (all if empty), in catalog order"""
+        if not partial_query:
+            return self.suggestions[:limit]
+
+        query = partial_query.lower()
+        matches = set()
+        position = bisect.bisect_left(self._suffixes, query)
+        while position < len(self._suffixes) and self._suffixes[position].startswith(query):
+            matches.add(self._owners[position])
+            position += 1
+
+        return [self.suggestions[index] for index in sorted(matches)[:limit]]
+
+
+_SUGGESTION_INDEX = SuggestionIndex([
+    "Show me all entities",
+    "Find all organizations",
+    "What are the relationships for [entity name]?",
+    "Find entities related to [entity name]",
+    "Show all people in the graph",
+    "List all locations",
+    "What does [entity name] relate to?",
+    "Find connections between [entity1] and [entity2]"
+])
 
 class QueryAgent:
     """Agent for processing natural language queries against the knowledge graph"""
@@ -30,6 +305,34 @@ class QueryAgent:
         self.llm = None
         self.initialized = False
 
+        # prompt | llm pipelines, built once in initialize(). The Cypher chain is
+        # swapped for a context-cached model when GEMINI_CONTEXT_CACHE is enabled
+        self._cypher_chain = None
+        self._explain_chain = None
+        self._summary_chain = None
+
+        # LRU cache of process_query results, keyed by normalized query. The
+        # agent is shared by every session and upload thread (which call
+        # clear_cache), so all cache access goes through _cache_lock
+        self._cache_lock = threading.Lock()
+        self._result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Bumped by clear_cache; a query that started before a clear read the
+        # old graph, so its answer is not stored
+        self._cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Queries that matched nothing, keyed the same way and mapped to
+        # (expiry time, result); short-lived so retyped queries are instant
+        # without pinning misses in the result cache
+        self._negative_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        # NL -> (Cypher, explanation template) doesn't depend on graph contents,
+        # so it is cached separately and survives clear_cache()
+        self._generate_plan_cached = lru_cache(maxsize=config.CYPHER_CACHE_SIZE)(
+            self._generate_plan_uncached
+        )
+
     def initialize(self) -> bool:
         """
         Initialize the LLM for query processing
@@ -43,19 +346,144 @@ class QueryAgent:
                 return False
 
                 # Switch to Google Gemini
-            self.llm = ChatGoogleGenerativeAI(
-                model=config.AI_MODEL,
-                temperature=0,
-                google_api_key=config.GOOGLE_API_KEY
-            )
+            self.llm = _make_llm(config.AI_MODEL, config.GOOGLE_API_KEY)
+            # Cypher plans come back as JSON; JSON mode stops the model from
+            # spending output tokens on markdown fences and prose
+            cypher_llm = _make_llm(config.AI_MODEL, config.GOOGLE_API_KEY, "application/json")
+            self._cypher_chain = _CYPHER_PROMPT | cypher_llm
+            self._explain_chain = _EXPLAIN_PROMPT | self.llm
+            self._summary_chain = _SUMMARY_PROMPT | self.llm
+            if config.GEMINI_CONTEXT_CACHE:
+                self._enable_context_cache()
 
             self.initialized = True
             logger.info("Query agent initialized with Gemini")
             return True
         except Exception as e:
-            logger.error(f"Failed to initialize: {str(e)}")
+            logger.error("Failed to initialize: %s", e)
             return False
 
+    def _enable_context_cache(self):
+        """
+        Register the static Cypher system prompt as Gemini cached content so it
+        isn't re-sent with every question. Gemini rejects caches below a minimum
+        token count; on any failure the full prompt is sent as before.
+        """
+        try:
+            from langchain_google_genai import create_context_cache
+
+            cache_name = create_context_cache(
+                self.llm,
+                messages=[SystemMessage(content=_CYPHER_SYSTEM_PROMPT)],
+                ttl=config.GEMINI_CACHE_TTL
+            )
+            cached_llm = _make_llm(config.AI_MODEL, config.GOOGLE_API_KEY,
+                                   "application/json", cached_content=cache_name)
+            self._cypher_chain = _CYPHER_QUESTION_PROMPT | cached_llm
+            logger.info("Cypher system prompt cached as %s", cache_name)
+        except Exception as e:
+            logger.warning("Gemini context caching unavailable, sending full prompt: %s", e)
+
+    @staticmethod
+    def _normalize_query(natural_language_query: str) -> str:
+        """
+        Collapse whitespace so equivalent phrasings share a cache key.
+        Case is preserved: entity names end up in case-sensitive Cypher literals.
+        """
+        return " ".join(natural_language_query.split())
+
+    def clear_cache(self):
+        """Drop cached query results (call after the graph changes); generated Cypher is kept"""
+        with self._cache_lock:
+            self._result_cache.clear()
+            self._negative_cache.clear()
+            self._cache_generation += 1
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Return result cache hit/miss counters and result/negative cache sizes, plus Cypher cache counters"""
+        cypher_info = self._generate_plan_cached.cache_info()
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._result_cache),
+            "negative_size": len(self._negative_cache),
+            "cypher_hits": cypher_info.hits,
+            "cypher_misses": cypher_info.misses,
+            "cypher_size": cypher_info.currsize
+        }
+
+    def _generate_plan_uncached(self, natural_language_query: str) -> Tuple[str, Optional[str]]:
+        """
+        Ask the LLM for a Cypher query plus an explanation template in one call.
+        Raises on failure so errors are never cached.
+
+        Returns:
+            (cypher query, result template or None if the model didn't provide one)
+        """
+        response = self._invoke_with_retry(self._cypher_chain, {"question": natural_language_query})
+        return self._parse_plan(response.content)
+
+    @staticmethod
+    def _invoke_with_retry(chain, inputs: Dict[str, Any]):
+        """Invoke a chain, retrying transient API errors with exponential backoff and jitter"""
+        # At least one call, so LLM_MAX_RETRIES=0 can't return None
+        attempts = max(1, config.LLM_MAX_RETRIES)
+        for attempt in range(attempts):
+            try:
+                return chain.invoke(inputs)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == attempts - 1:
+                    raise
+                delay = min(2 ** attempt, 30) + random.uniform(0, 1)
+                logger.warning("LLM call failed (%s), retrying in %.1fs", e, delay)
+                time.sleep(delay)
+
+    @staticmethod
+    def _parse_plan(response_content: str) -> Tuple[str, Optional[str]]:
+        """Parse a Cypher plan reply into (cypher, result template); raises if it has no Cypher"""
+        response_text = response_content.strip()
+
+        try:
+            plan = json.loads(response_text)
+        except json.JSONDecodeError:
+            # JSON mode unsupported by this model; strip markdown fences and retry
+            response_text = _FENCE_RE.sub("", response_text).strip()
+            try:
+                plan = json.loads(response_text)
+            except json.JSONDecodeError:
+                plan = None
+
+        if isinstance(plan, dict):
+            cypher_query = str(plan.get("cypher", "")).strip()
+            result_template = plan.get("result_template")
+            if not isinstance(result_template, str):
+                result_template = None
+        else:
+            # Model ignored the JSON format; treat the response as bare Cypher
+            cypher_query, result_template = response_text, None
+
+        if not cypher_query:
+            raise ValueError("LLM returned an empty Cypher query")
+
+        logger.info("Generated Cypher query: %s", cypher_query)
+        return cypher_query, result_template
+
+    def _generate_plan(self, natural_language_query: str) -> Tuple[Optional[str], Optional[str]]:
+        """Cached (cypher, result template) for a query; (None, None) on failure"""
+        normalized_query = self._normalize_query(natural_language_query)
+        if config.QUERY_FAST_PATH:
+            plan = _fast_path_plan(normalized_query)
+            if plan:
+                logger.info("Fast-path Cypher query: %s", plan[0])
+                return plan
+
+        try:
+            return self._generate_plan_cached(normalized_query)
+
+        except _LLM_ERRORS as e:
+            logger.error("Error generating Cypher query: %s", e)
+            return None, None
+
     def generate_cypher_query(self, natural_language_query: str) -> Optional[str]:
         """
         Convert natural language query to Cypher query
@@ -70,36 +498,67 @@ class QueryAgent:
             logger.error("Query agent not initialized")
             return None
 
-        try:
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content="""You are an expert at converting natural language questions 
-into Neo4j Cypher queries. Generate ONLY the Cypher query, no explanations.
-
-Common patterns:
-- Find entity: MATCH (e:Type {name: "EntityName"}) RETURN e
-- Find relationships: MATCH (e1)-[r]->(e2) WHERE e1.name = "Name" RETURN e1, r, e2
-- Search: MATCH (e) WHERE e.name CONTAINS "SearchTerm" RETURN e
-- Count: MATCH (n:Type) RETURN count(n)
-- Get related: MATCH (e {name: "Name"})-[r]-(other) RETURN other
-
-Entity types in the graph: Person, Organization, Location, Concept, Product, Date, Event, Technology
-Relationship types: WORKS_FOR, LOCATED_IN, RELATED_TO, OWNS, CREATED, MANAGES, PARTICIPATED_IN
+        return self._generate_plan(natural_language_query)[0]
 
-Generate only the Cypher query without any markdown formatting or explanations."""),
-                HumanMessage(content=f"Convert this question to Cypher: {natural_language_query}")
-            ])
+    def generate_cypher_queries(self, natural_language_queries: List[str]) -> List[Optional[str]]:
+        """
+        Convert many natural language queries to Cypher in one batched call
+        (e.g. for evaluation runs); requests fan out concurrently over the
+        shared client. Results are not added to the Cypher cache.
 
-            response = self.llm.invoke(prompt.format_messages())
-            cypher_query = response.content.strip()
+        Args:
+            natural_language_queries: User queries
 
-            # Clean up the query
-            cypher_query = cypher_query.replace("```cypher", "").replace("```", "").strip()
+        Returns:
+            Cypher query string or None for each query, in input order
+        """
+        if not self.initialized:
+            logger.error("Query agent not initialized")
+            return [None] * len(natural_language_queries)
 
-            logger.info(f"Generated Cypher query: {cypher_query}")
-            return cypher_query
+        questions = [self._normalize_query(query) for query in natural_language_queries]
+        cypher_queries: List[Optional[str]] = [None] * len(questions)
 
-        except Exception as e:
-            logger.error(f"Error generating Cypher query: {str(e)}")
+        # Only questions the fast path can't answer go to the LLM
+        pending = []
+        for index, question in enumerate(questions):
+            plan = _fast_path_plan(question) if config.QUERY_FAST_PATH else None
+            if plan:
+                cypher_queries[index] = plan[0]
+            else:
+                pending.append(index)
+
+        if not pending:
+            return cypher_queries
+
+        responses = self._cypher_chain.batch(
+            [{"question": questions[index]} for index in pending],
+            config={"max_concurrency": config.LLM_CONCURRENCY},
+            return_exceptions=True
+        )
+
+        for index, response in zip(pending, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                cypher_queries[index] = self._parse_plan(response.content)[0]
+            except _LLM_ERRORS as e:
+                logger.error("Error generating Cypher query: %s", e)
+        return cypher_queries
+
+    @staticmethod
+    def _fill_template(result_template: Optional[str], results: List[Dict]) -> Optional[str]:
+        """Fill the model's explanation template locally; None if it is missing or malformed"""
+        if not result_template:
+            return None
+        try:
+            return result_template.format(
+                count=len(results),
+                sample=str(results[:3]) if results else "no results"
+            )
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError):
+            # The template comes from the model: unknown fields, attribute or
+            # index access like {count.foo} or {count[0]} and bad format specs
             return None
 
     def process_query(self, natural_language_query: str) -> Dict[str, Any]:
@@ -119,9 +578,29 @@ Generate only the Cypher query without any markdown formatting or explanations."
                 "results": []
             }
 
+        cache_key = self._normalize_query(natural_language_query)
+        with self._cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                # Deep copies: callers may edit results and their rows
+                return copy.deepcopy(cached)
+
+            negative = self._negative_cache.get(cache_key)
+            if negative is not None:
+                expires_at, cached = negative
+                if time.monotonic() < expires_at:
+                    self.cache_hits += 1
+                    return copy.deepcopy(cached)
+                # Expired
+                self._negative_cache.pop(cache_key, None)
+            self.cache_misses += 1
+            generation = self._cache_generation
+
         try:
-            # Generate Cypher query
-            cypher_query = self.generate_cypher_query(natural_language_query)
+            # Generate Cypher query and explanation template in one LLM call
+            cypher_query, result_template = self._generate_plan(natural_language_query)
 
             if not cypher_query:
                 return {
@@ -132,15 +611,20 @@ Generate only the Cypher query without any markdown formatting or explanations."
 
             # Execute query
             results = self.graph_manager.query_graph(cypher_query)
-
-            # Generate explanation
-            explanation = self.explain_results(
-                natural_language_query,
-                cypher_query,
-                results
-            )
-
-            return {
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Query returned %d rows: %s", len(results), str(results[:10]))
+
+            # Generate explanation, falling back to a second LLM call only when
+            # the template can't be used
+            explanation = self._fill_template(result_template, results)
+            if explanation is None:
+                explanation = self.explain_results(
+                    natural_language_query,
+                    cypher_query,
+                    results
+                )
+
+            result = {
                 "success": True,
                 "query": cypher_query,
                 "results": results,
@@ -148,14 +632,46 @@ Generate only the Cypher query without any markdown formatting or explanations."
                 "result_count": len(results)
             }
 
+            # Not stored if the graph changed (clear_cache ran) while this query ran
+            with self._cache_lock:
+                if generation == self._cache_generation:
+                    if results:
+                        self._result_cache[cache_key] = result
+                        if len(self._result_cache) > config.QUERY_CACHE_SIZE:
+                            self._result_cache.popitem(last=False)
+                    else:
+                        self._negative_cache[cache_key] = (time.monotonic() + config.NEGATIVE_CACHE_TTL, result)
+                        if len(self._negative_cache) > config.NEGATIVE_CACHE_SIZE:
+                            self._negative_cache.popitem(last=False)
+
+            return copy.deepcopy(result)
+
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}")
+            logger.error("Error processing query: %s", e)
             return {
                 "success": False,
                 "error": str(e),
                 "results": []
             }
 
+    async def aprocess_query(self, natural_language_query: str) -> Dict[str, Any]:
+        """
+        Async variant of process_query for event-loop callers.
+
+        The LLM and graph calls are blocking, so the whole pipeline runs in the
+        loop's default executor; independent queries awaited together (e.g. with
+        asyncio.gather) then overlap instead of running back to back. Caches are
+        shared with process_query.
+
+        Args:
+            natural_language_query: User's natural language query
+
+        Returns:
+            Dictionary containing query results and metadata
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process_query, natural_language_query)
+
     def explain_results(self, natural_query: str, cypher_query: str,
                        results: List[Dict]) -> str:
         """
@@ -169,31 +685,72 @@ Generate only the Cypher query without any markdown formatting or explanations."
         Returns:
             Natural language explanation
         """
-        if not self.initialized:
-            return "Query agent not initialized"
+        return "".join(self.stream_explanation(natural_query, cypher_query, results)).strip()
 
-        try:
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content="""You are explaining query results from a knowledge graph. 
-Provide a clear, concise explanation of what was found. Be specific and mention entity names."""),
-                HumanMessage(content=f"""
-Original question: {natural_query}
+    def stream_explanation(self, natural_query: str, cypher_query: str,
+                           results: List[Dict]) -> Iterator[str]:
+        """
+        Stream a natural language explanation of query results as it is generated,
+        so UIs can render from the first token instead of waiting for the full reply
 
-Query executed: {cypher_query}
+        Args:
+            natural_query: Original natural language query
+            cypher_query: Generated Cypher query
+            results: Query results
 
-Results found: {len(results)}
+        Yields:
+            Pieces of the explanation text
+        """
+        if not self.initialized:
+            yield "Query agent not initialized"
+            return
 
-Sample results: {str(results[:3]) if results else "No results"}
+        # Empty and single-row results have near-deterministic explanations
+        if len(results) < 2:
+            yield self._explain_trivial_results(cypher_query, results)
+            return
 
-Provide a brief, natural explanation of these results.""")
-            ])
+        try:
+            inputs = dict(
+                natural_query=natural_query,
+                cypher_query=cypher_query,
+                result_count=len(results),
+                sample_results=json.dumps(
+                    [_compact(row) for row in results[:3]],
+                    separators=(",", ":"),
+                    ensure_ascii=False,
+                    default=str
+                )
+            )
 
-            response = self.llm.invoke(prompt.format_messages())
-            return response.content.strip()
+            for chunk in self._explain_chain.stream(inputs):
+                if chunk.content:
+                    yield chunk.content
 
         except Exception as e:
-            logger.error(f"Error explaining results: {str(e)}")
-            return f"Found {len(results)} results"
+            # Any failure (transport errors included) falls back to the count,
+            # so already-fetched graph results are never thrown away
+            logger.error("Error explaining results: %s", e)
+            yield f"Found {len(results)} results"
+
+    @staticmethod
+    def _explain_trivial_results(cypher_query: str, results: List[Dict]) -> str:
+        """Explain zero or one result rows without an LLM call"""
+        if not results:
+            match = _SEARCH_TERM_RE.search(cypher_query or "")
+            if match:
+                return f'No results found for "{match.group(1)}".'
+            return "No results found for this question."
+
+        details = []
+        for key, value in results[0].items():
+            if isinstance(value, dict):
+                label = value.get('name', key)
+                entity_type = value.get('type')
+                details.append(f"{label} ({entity_type})" if entity_type else str(label))
+            else:
+                details.append(f"{key}: {value}")
+        return f"Found 1 result: {', '.join(details)}."
 
     def get_entity_info(self, entity_name: str) -> Dict[str, Any]:
         """
@@ -206,11 +763,14 @@ Provide a brief, natural explanation of these results.""")
             Dictionary with entity information
         """
         try:
-            # Get entity details
-            entity = self.graph_manager.get_entity(entity_name)
-
-            # Get relationships
-            relationships = self.graph_manager.get_entity_relationships(entity_name)
+            # Entity details and relationships are independent lookups, so
+            # fetch them concurrently
+            entity_future = _GRAPH_EXECUTOR.submit(self.graph_manager.get_entity, entity_name)
+            relationships_future = _GRAPH_EXECUTOR.submit(
+                self.graph_manager.get_entity_relationships, entity_name
+            )
+            entity = entity_future.result()
+            relationships = relationships_future.result()
 
             # Generate summary
             if self.initialized and entity:
@@ -226,7 +786,7 @@ Provide a brief, natural explanation of these results.""")
             }
 
         except Exception as e:
-            logger.error(f"Error getting entity info: {str(e)}")
+            logger.error("Error getting entity info: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -245,24 +805,39 @@ Provide a brief, natural explanation of these results.""")
         Returns:
             Natural language summary
         """
-        try:
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content="""You are summarizing information about an entity from a knowledge graph.
-Provide a clear, informative summary mentioning the entity's properties and key relationships."""),
-                HumanMessage(content=f"""
-Entity: {entity_name}
-Properties: {entity_data}
-Relationships: {relationships}
+        return "".join(self.stream_entity_summary(entity_name, entity_data, relationships)).strip()
+
+    def stream_entity_summary(self, entity_name: str, entity_data: Dict,
+                              relationships: List[Dict]) -> Iterator[str]:
+        """
+        Stream a natural language summary of an entity as it is generated
+
+        Args:
+            entity_name: Name of the entity
+            entity_data: Entity properties
+            relationships: List of relationships
 
-Provide a brief summary of this entity and its connections.""")
-            ])
+        Yields:
+            Pieces of the summary text
+        """
+        if not self.initialized:
+            yield f"Entity: {entity_name}"
+            return
+
+        try:
+            inputs = dict(
+                entity_name=entity_name,
+                entity_data=entity_data,
+                relationships=relationships
+            )
 
-            response = self.llm.invoke(prompt.format_messages())
-            return response.content.strip()
+            for chunk in self._summary_chain.stream(inputs):
+                if chunk.content:
+                    yield chunk.content
 
         except Exception as e:
-            logger.error(f"Error summarizing entity: {str(e)}")
-            return f"{entity_name} - {len(relationships)} relationships"
+            logger.error("Error summarizing entity: %s", e)
+            yield f"{entity_name} - {len(relationships)} relationships"
 
     def get_suggestions(self, partial_query: str) -> List[str]:
         """
@@ -274,19 +849,4 @@ Provide a brief summary of this entity and its connections.""")
         Returns:
             List of query suggestions
         """
-        suggestions = [
-            "Show me all entities",
-            "Find all organizations",
-            "What are the relationships for [entity name]?",
-            "Find entities related to [entity name]",
-            "Show all people in the graph",
-            "List all locations",
-            "What does [entity name] relate to?",
-            "Find connections between [entity1] and [entity2]"
-        ]
-
-        if partial_query:
-            # Filter suggestions based on partial query
-            suggestions = [s for s in suggestions if partial_query.lower() in s.lower()]
-
-        return suggestions[:5]
\ No newline at end of file
+        return _SUGGESTION_INDEX.search(partial_query, limit=5)
@@ -3,14 +3,45 @@ Streamlit UI for GraphNet application.
 User interface for uploading documents, querying the graph, and visualizing results.
 """
 
+import gzip
+import inspect
+import logging
 import streamlit as st
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List
 import streamlit.components.v1 as components
 
-from main import GraphNet
-from config import config
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+from ai.document_processor import DocumentProcessor
+from config import config, CONFIG_DICT
+
+if TYPE_CHECKING:
+    # main pulls in the Neo4j driver, LangChain and pyvis; it is imported
+    # lazily in get_graphnet() so pages that never initialize skip that cost
+    from main import GraphNet
+
+# Logging is configured by the entrypoint only, so importing GraphNet modules
+# leaves the root logger alone
+logging.basicConfig(level=logging.INFO)
+
+# Fragments rerun only their own widgets' subtree; st.fragment replaced
+# st.experimental_fragment in Streamlit 1.37, and older releases rerun the page
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Expanders that track their state (on_change="rerun") expose .open, so
+# collapsed content can be skipped; older releases always run the body
+EXPANDER_KWARGS = (
+    {"key": "quick_stats_open", "on_change": "rerun"}
+    if "on_change" in inspect.signature(st.expander).parameters else {}
+)
 
 # Page configuration
 st.set_page_config(
@@ -21,7 +52,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
     <style>
     .main-header {
         font-size: 3rem;
@@ -72,26 +103,159 @@ st.markdown("""
         margin: 1rem 0;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit clears anything a rerun doesn't emit, so the stylesheet is sent on
+# every run; st.html (1.33+) injects it as-is instead of through the markdown parser
+if hasattr(st, "html"):
+    st.html(CUSTOM_CSS)
+else:
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Static home-page copy; when python-markdown is installed it is converted to
+# HTML once per process and emitted without re-parsing on every visit (nested
+# lists use four-space indents, which python-markdown requires)
+HOME_MD = """\
+### What is GraphNet?
+
+GraphNet is an AI-powered knowledge graph system that transforms unstructured corporate data 
+into structured, explainable, and actionable insights. It combines:
+
+- 🤖 **Large Language Models (LLMs)** for intelligent entity extraction
+- 🔗 **LangChain** for coordinated multi-agent processing
+- 🗄️ **Neo4j** for powerful graph database storage
+- 🎨 **Interactive Visualization** for intuitive knowledge exploration
+
+### Key Features
+
+1. **📄 Multi-Format Document Processing**
+    - Support for PDF, Word, Excel, PowerPoint, text files, and more
+    - Automatic text extraction and chunking
+
+2. **🧠 Intelligent Entity Extraction**
+    - Identifies people, organizations, locations, concepts, and more
+    - Discovers relationships between entities
+    - Source-linked and traceable results
+
+3. **💬 Natural Language Querying**
+    - Ask questions in plain English
+    - AI-powered query understanding
+    - Explainable answers with entity connections
+
+4. **📊 Graph Visualization**
+    - Interactive network diagrams
+    - Color-coded entity types
+    - Relationship exploration
+
+### Getting Started
+
+1. **Initialize**: Click "Initialize/Reconnect" in the sidebar
+2. **Upload**: Go to "Upload Documents" to add your data
+3. **Query**: Use "Query Graph" to ask questions
+4. **Visualize**: Explore the "Visualize" page to see your knowledge graph
+
+### Requirements
+
+Make sure you have configured:
+
+- ✅ Gemini API Key (for LLM processing)
+- ✅ Neo4j Database (running and accessible)
 
+Check the Settings page to verify your configuration.
+"""
+HOME_HTML_SUPPORTED = markdown is not None and hasattr(st, "html")
+
+
+@st.cache_data
+def home_html() -> str:
+    """Render HOME_MD to HTML once"""
+    return markdown.markdown(HOME_MD)
+
+
+# Most recent queries kept per session (newest first)
+QUERY_HISTORY_SIZE = 50
+# Shown on the query page
+QUERY_HISTORY_SHOWN = 5
+
+# Initialize session state (user-scoped only; GraphNet itself is shared).
+# setdefault fills in each missing key, so sessions that predate a new key get it too
+for key, default in {
+    "initialized": False,
+    "processed_files": [],
+    "query_history": deque(maxlen=QUERY_HISTORY_SIZE),
+    # Visualization file written by this session, if any
+    "viz_path": None,
+}.items():
+    st.session_state.setdefault(key, default)
+
+
+class GraphNetInitError(Exception):
+    """Raised when the shared GraphNet instance fails to initialize"""
+
+    def __init__(self, status: dict):
+        super().__init__("; ".join(status.get('errors', [])) or "Initialization failed")
+        self.status = status
+
+
+@st.cache_resource(show_spinner=False)
+def get_graphnet() -> "GraphNet":
+    """
+    GraphNet instance shared by all sessions and reruns, so the graph database
+    driver and LLM clients are created once per server process. Failed
+    initializations raise and are therefore not cached.
+    """
+    from main import GraphNet
 
-# Initialize session state
-if 'graphnet' not in st.session_state:
-    st.session_state.graphnet = None
-    st.session_state.initialized = False
-    st.session_state.processed_files = []
-    st.session_state.query_history = []
+    graphnet = GraphNet()
+    init_status = graphnet.initialize()
+    if not init_status['overall']:
+        graphnet.shutdown()
+        raise GraphNetInitError(init_status)
+    return graphnet
 
 
-def initialize_graphnet():
-    """Initialize GraphNet application"""
-    if st.session_state.graphnet is None:
-        with st.spinner("Initializing GraphNet..."):
-            st.session_state.graphnet = GraphNet()
-            init_status = st.session_state.graphnet.initialize()
-            st.session_state.initialized = init_status['overall']
-            return init_status
-    return {"overall": st.session_state.initialized}
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_stats(graph_version: int) -> dict:
+    """
+    Graph statistics, re-queried at most every 30s or when graph_version
+    changes. Pass the shared GraphNet's graph_version (see graph_stats), so a
+    write from any session invalidates every session's entry.
+    """
+    return get_graphnet().get_graph_statistics()
+
+
+def graph_stats() -> dict:
+    """cached_stats for the shared graph's current version"""
+    return cached_stats(get_graphnet().graph_version)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_viz(path: str, mtime: float) -> str:
+    """
+    Visualization HTML, re-read from disk only when the file's mtime changes.
+    Every render rewrites the same file, so only the latest page is kept;
+    older entries could never be hit again.
+    """
+    return Path(path).read_text(encoding="utf-8")
+
+
+def initialize_graphnet(reconnect: bool = False):
+    """Initialize GraphNet application, reusing the shared instance unless reconnecting"""
+    if reconnect:
+        try:
+            get_graphnet().shutdown()
+        except GraphNetInitError:
+            pass
+        get_graphnet.clear()
+
+    try:
+        get_graphnet()
+        init_status = {"overall": True}
+    except GraphNetInitError as e:
+        init_status = e.status
+
+    st.session_state.initialized = init_status['overall']
+    return init_status
 
 
 def main():
@@ -118,7 +282,7 @@ def main():
         # Initialize button
         if st.button("🔄 Initialize/Reconnect", use_container_width=True):
             with st.spinner("Initializing..."):
-                init_status = initialize_graphnet()
+                init_status = initialize_graphnet(reconnect=st.session_state.initialized)
                 
                 if init_status['overall']:
                     st.success("✓ Connected successfully!")
@@ -136,18 +300,17 @@ def main():
         
         st.markdown("---")
         
-        # Quick stats
-        if st.session_state.initialized and st.session_state.graphnet:
-            st.subheader("Quick Stats")
-            try:
-                stats = st.session_state.graphnet.get_graph_statistics()
-                db_stats = stats.get('database', {})
-                
-                st.metric("Nodes", db_stats.get('node_count', 0))
-                st.metric("Relationships", db_stats.get('relationship_count', 0))
-                st.metric("Files Processed", len(st.session_state.processed_files))
-            except:
-                st.info("Unable to load statistics")
+        # Quick stats (collapsed by default; only queried while open)
+        if st.session_state.initialized:
+            quick_stats = st.expander("Quick Stats", expanded=False, **EXPANDER_KWARGS)
+            with quick_stats:
+                if getattr(quick_stats, "open", None) is not False:
+                    stats = graph_stats()
+                    db_stats = stats.get('database', {})
+                    
+                    st.metric("Nodes", db_stats.get('node_count', 0))
+                    st.metric("Relationships", db_stats.get('relationship_count', 0))
+                    st.metric("Files Processed", len(st.session_state.processed_files))
     
     # Main content area
     if page == "🏠 Home":
@@ -168,53 +331,10 @@ def show_home_page():
     """Display home page"""
     st.header("Welcome to GraphNet")
     
-    st.markdown("""
-    ### What is GraphNet?
-    
-    GraphNet is an AI-powered knowledge graph system that transforms unstructured corporate data 
-    into structured, explainable, and actionable insights. It combines:
-    
-    - 🤖 **Large Language Models (LLMs)** for intelligent entity extraction
-    - 🔗 **LangChain** for coordinated multi-agent processing
-    - 🗄️ **Neo4j** for powerful graph database storage
-    - 🎨 **Interactive Visualization** for intuitive knowledge exploration
-    
-    ### Key Features
-    
-    1. **📄 Multi-Format Document Processing**
-       - Support for PDF, Word, Excel, PowerPoint, text files, and more
-       - Automatic text extraction and chunking
-    
-    2. **🧠 Intelligent Entity Extraction**
-       - Identifies people, organizations, locations, concepts, and more
-       - Discovers relationships between entities
-       - Source-linked and traceable results
-    
-    3. **💬 Natural Language Querying**
-       - Ask questions in plain English
-       - AI-powered query understanding
-       - Explainable answers with entity connections
-    
-    4. **📊 Graph Visualization**
-       - Interactive network diagrams
-       - Color-coded entity types
-       - Relationship exploration
-    
-    ### Getting Started
-    
-    1. **Initialize**: Click "Initialize/Reconnect" in the sidebar
-    2. **Upload**: Go to "Upload Documents" to add your data
-    3. **Query**: Use "Query Graph" to ask questions
-    4. **Visualize**: Explore the "Visualize" page to see your knowledge graph
-    
-    ### Requirements
-    
-    Make sure you have configured:
-    - ✅ Gemini API Key (for LLM processing)
-    - ✅ Neo4j Database (running and accessible)
-    
-    Check the Settings page to verify your configuration.
-    """)
+    if HOME_HTML_SUPPORTED:
+        st.html(home_html())
+    else:
+        st.markdown(HOME_MD)
     
     # Status check
     col1, col2, col3 = st.columns(3)
@@ -287,34 +407,56 @@ def show_upload_page():
 
 def process_documents(uploaded_files: List):
     """Process uploaded documents"""
+    # Skip files whose content was already processed in this session (or that
+    # appear twice in this upload) before any extraction work starts
+    seen_hashes = {file_info.get('hash') for file_info in st.session_state.processed_files}
+    pending_files = []
+    content_hashes = []
+    for uploaded_file in uploaded_files:
+        content_hash = DocumentProcessor.hash_stream(uploaded_file)
+        if content_hash in seen_hashes:
+            st.info(f"⏭️ Skipping {uploaded_file.name}: identical content was already processed")
+            continue
+        seen_hashes.add(content_hash)
+        pending_files.append(uploaded_file)
+        content_hashes.append(content_hash)
+    
+    if not pending_files:
+        return
+    uploaded_files = pending_files
+    
     progress_bar = st.progress(0)
     status_text = st.empty()
     
     total_files = len(uploaded_files)
-    results = []
-    
-    for idx, uploaded_file in enumerate(uploaded_files):
-        status_text.text(f"Processing {uploaded_file.name} ({idx + 1}/{total_files})...")
+    results = [None] * total_files
+    graphnet = get_graphnet()
+    status_text.text(f"Processing {total_files} file(s)...")
+    
+    # Documents are dominated by LLM and database round-trips, so process
+    # several at once; Streamlit calls stay on this script thread
+    with ThreadPoolExecutor(max_workers=max(1, min(config.MAX_CONCURRENT_UPLOADS, total_files))) as executor:
+        futures = {
+            executor.submit(
+                graphnet.process_document_stream,
+                uploaded_file,
+                file_extension=Path(uploaded_file.name).suffix,
+                filename=uploaded_file.name
+            ): idx
+            for idx, uploaded_file in enumerate(uploaded_files)
+        }
         
-        # Get file extension
-        file_extension = Path(uploaded_file.name).suffix
-        
-        # Read file bytes
-        file_bytes = uploaded_file.read()
-        
-        # Process document
-        result = st.session_state.graphnet.process_document(
-            file_bytes=file_bytes,
-            file_extension=file_extension,
-            filename=uploaded_file.name
-        )
-        
-        results.append(result)
-        
-        if result.get('success'):
-            st.session_state.processed_files.append(result)
-        
-        progress_bar.progress((idx + 1) / total_files)
+        for completed, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            result = future.result()
+            results[idx] = result
+            
+            if result.get('success'):
+                result['hash'] = content_hashes[idx]
+                st.session_state.processed_files.append(result)
+            
+            status_text.text(f"Processed {uploaded_files[idx].name} ({completed}/{total_files})...")
+            progress_bar.progress(completed / total_files)
     
     status_text.empty()
     progress_bar.empty()
@@ -341,6 +483,7 @@ def process_documents(uploaded_files: List):
             st.error(f"**{result.get('filename', 'Unknown')}**: {result.get('error', 'Processing failed')}")
 
 
+@fragment
 def show_query_page():
     """Display query page"""
     st.header("🔍 Query Knowledge Graph")
@@ -354,10 +497,11 @@ def show_query_page():
     # Query input
     query = st.text_input(
         "Enter your question:",
+        key="query",
         placeholder="e.g., 'Show me all organizations' or 'What are the relationships for John Doe?'"
     )
     
-    # Example queries
+    # Example queries: one selectbox whose callback fills the question box
     with st.expander("💡 Example Queries"):
         examples = [
             "Show me all entities",
@@ -366,9 +510,12 @@ def show_query_page():
             "What locations are mentioned?",
             "Show relationships for [entity name]"
         ]
-        for example in examples:
-            if st.button(example, key=f"example_{example}"):
-                query = example
+        st.selectbox(
+            "Examples",
+            [EXAMPLE_PLACEHOLDER] + examples,
+            key="example_choice",
+            on_change=use_example_query
+        )
     
     if query:
         if st.button("🔍 Search", type="primary"):
@@ -379,7 +526,7 @@ def show_query_page():
         st.markdown("---")
         st.subheader("📜 Query History")
         
-        for i, hist in enumerate(reversed(st.session_state.query_history[-5:])):
+        for i, hist in enumerate(islice(st.session_state.query_history, QUERY_HISTORY_SHOWN)):
             with st.expander(f"Query: {hist['query'][:50]}..."):
                 st.write("**Question:**", hist['query'])
                 st.write("**Results:**", hist['result_count'])
@@ -387,12 +534,22 @@ def show_query_page():
                     st.write("**Explanation:**", hist['explanation'])
 
 
+EXAMPLE_PLACEHOLDER = "—"
+
+
+def use_example_query():
+    """Copy the chosen example into the question box (runs before the rerun)"""
+    choice = st.session_state.example_choice
+    if choice != EXAMPLE_PLACEHOLDER:
+        st.session_state.query = choice
+
+
 def execute_query(query: str):
     """Execute a natural language query"""
     with st.spinner("Searching knowledge graph..."):
-        result = st.session_state.graphnet.query(query)
+        result = get_graphnet().query(query)
         
-        st.session_state.query_history.append({
+        st.session_state.query_history.appendleft({
             'query': query,
             'result': result,
             'result_count': result.get('result_count', 0),
@@ -418,6 +575,7 @@ def execute_query(query: str):
             st.error(f"❌ Query failed: {result.get('error', 'Unknown error')}")
 
 
+@fragment
 def show_visualization_page():
     """Display visualization page"""
     st.header("📊 Graph Visualization")
@@ -438,10 +596,15 @@ def show_visualization_page():
             generate_visualization(limit)
     
     # Display visualization
-    if os.path.exists("graph_visualization.html"):
-        with open("graph_visualization.html", 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
+    html_content = None
+    viz_path = st.session_state.get('viz_path')
+    if viz_path:
+        try:
+            html_content = load_viz(viz_path, os.path.getmtime(viz_path))
+        except OSError:
+            st.session_state.viz_path = None
+    
+    if html_content is not None:
         components.html(html_content, height=800, scrolling=True)
     else:
         st.info("👆 Click 'Generate Visualization' to view your knowledge graph")
@@ -451,13 +614,26 @@ def generate_visualization(limit: int):
     """Generate graph visualization"""
     with st.spinner("Creating visualization..."):
         try:
-            filename = st.session_state.graphnet.visualize_graph(limit=limit)
+            filename = get_graphnet().visualize_graph(limit=limit)
+            st.session_state.viz_path = filename
             st.success(f"✅ Visualization created: {filename}")
-            st.rerun()
         except Exception as e:
             st.error(f"❌ Visualization failed: {str(e)}")
 
 
+def show_type_counts(counts: List[tuple], total: int, label: str):
+    """Render (name, count) pairs as one table with a share-of-total bar column"""
+    total = max(1, total)
+    st.dataframe(
+        [{label: name, "Count": count, "Share": count / total} for name, count in counts],
+        column_config={
+            "Share": st.column_config.ProgressColumn(min_value=0, max_value=1, format="%.2f")
+        },
+        hide_index=True
+    )
+
+
+@fragment
 def show_statistics_page():
     """Display statistics page"""
     st.header("📈 Graph Statistics")
@@ -467,7 +643,7 @@ def show_statistics_page():
         return
     
     try:
-        stats = st.session_state.graphnet.get_graph_statistics()
+        stats = graph_stats()
         db_stats = stats.get('database', {})
         vis_stats = stats.get('visualization', {})
         
@@ -490,11 +666,11 @@ def show_statistics_page():
         node_types = db_stats.get('node_types', [])
         
         if node_types:
-            for node_type in node_types:
-                labels = node_type.get('labels', ['Unknown'])
-                count = node_type.get('count', 0)
-                st.progress(count / max(1, db_stats.get('node_count', 1)), 
-                           text=f"{labels[0]}: {count}")
+            show_type_counts(
+                [(node_type.get('labels', ['Unknown'])[0], node_type.get('count', 0))
+                 for node_type in node_types],
+                db_stats.get('node_count', 1), "Entity Type"
+            )
         else:
             st.info("No entities in the graph yet")
         
@@ -503,11 +679,11 @@ def show_statistics_page():
         rel_types = db_stats.get('relationship_types', [])
         
         if rel_types:
-            for rel_type in rel_types:
-                rel_name = rel_type.get('type', 'Unknown')
-                count = rel_type.get('count', 0)
-                st.progress(count / max(1, db_stats.get('relationship_count', 1)),
-                           text=f"{rel_name}: {count}")
+            show_type_counts(
+                [(rel_type.get('type', 'Unknown'), rel_type.get('count', 0))
+                 for rel_type in rel_types],
+                db_stats.get('relationship_count', 1), "Relationship Type"
+            )
         else:
             st.info("No relationships in the graph yet")
         
@@ -531,7 +707,7 @@ def show_settings_page():
     
     st.subheader("🔧 Configuration")
     
-    config_dict = config.get_config_dict()
+    config_dict = CONFIG_DICT
     
     st.write("**Neo4j Configuration:**")
     st.code(f"""
@@ -566,7 +742,7 @@ Chunk Overlap: {config_dict['chunk_overlap']}
         if st.checkbox("I understand this will delete all data"):
             if st.session_state.initialized:
                 with st.spinner("Clearing graph..."):
-                    success = st.session_state.graphnet.clear_graph()
+                    success = get_graphnet().clear_graph()
                     if success:
                         st.success("✅ Graph data cleared")
                         st.session_state.processed_files = []
@@ -584,16 +760,17 @@ Chunk Overlap: {config_dict['chunk_overlap']}
         if st.session_state.initialized:
             with st.spinner("Exporting..."):
                 try:
-                    filename = st.session_state.graphnet.export_graph()
-                    st.success(f"✅ Graph exported to {filename}")
+                    raw = get_graphnet().export_graph(return_bytes=True)
+                    # Exports are repetitive JSON, so gzip shrinks them several-fold
+                    payload = gzip.compress(raw, compresslevel=6)
+                    st.success(f"✅ Graph exported ({len(raw):,} bytes, {len(payload):,} compressed)")
                     
-                    with open(filename, 'r') as f:
-                        st.download_button(
-                            "⬇️ Download JSON",
-                            f,
-                            file_name=filename,
-                            mime="application/json"
-                        )
+                    st.download_button(
+                        "⬇️ Download graph_export.json.gz",
+                        data=payload,
+                        file_name="graph_export.json.gz",
+                        mime="application/gzip"
+                    )
                 except Exception as e:
                     st.error(f"❌ Export failed: {str(e)}")
         else:
@@ -5,7 +5,8 @@ Manages environment variables and application settings.
 
 import os
 from dotenv import load_dotenv
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +17,11 @@ class Config:
 
     # Graph Database Mode: 'neo4j' or 'embedded'
     GRAPH_MODE = os.getenv("GRAPH_MODE", "embedded")  # Default to embedded
+    # Embedded mode: writes are appended to a log that is fsynced at most every
+    # EMBEDDED_PERSIST_INTERVAL seconds and folded into the snapshot every
+    # EMBEDDED_SNAPSHOT_OPS writes
+    EMBEDDED_PERSIST_INTERVAL = float(os.getenv("EMBEDDED_PERSIST_INTERVAL", "5"))
+    EMBEDDED_SNAPSHOT_OPS = int(os.getenv("EMBEDDED_SNAPSHOT_OPS", "1000"))
 
     # Neo4j Configuration
     NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -29,6 +35,11 @@ class Config:
     MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
     CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
     CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+    MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "4"))  # Documents processed at once
+
+    # Document extraction cache (keyed by file content hash)
+    DOC_CACHE_ENABLED = os.getenv("DOC_CACHE_ENABLED", "true").lower() == "true"
+    DOC_CACHE_TTL_HOURS = int(os.getenv("DOC_CACHE_TTL_HOURS", "24"))
     
     # Supported file formats
     SUPPORTED_FORMATS = [
@@ -39,10 +50,34 @@ class Config:
     # Entity extraction settings
     MAX_ENTITIES_PER_CHUNK = int(os.getenv("MAX_ENTITIES_PER_CHUNK", "20"))
     CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
+
+    # LLM request settings
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    LLM_RPM = int(os.getenv("LLM_RPM", "60"))  # Requests per minute
+    LLM_TPM = int(os.getenv("LLM_TPM", "1000000"))  # Input tokens per minute
+    MAX_INPUT_TOKENS = int(os.getenv("MAX_INPUT_TOKENS", "1000"))  # Per-chunk text budget
+    LLM_BATCH_TOKENS = int(os.getenv("LLM_BATCH_TOKENS", "2000"))  # Chunk text packed per call
     
+    # Query settings
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "512"))
+    CYPHER_CACHE_SIZE = int(os.getenv("CYPHER_CACHE_SIZE", "1024"))
+    # Answer common question shapes with rule-based Cypher instead of the LLM
+    QUERY_FAST_PATH = os.getenv("QUERY_FAST_PATH", "true").lower() == "true"
+    # Queries that matched nothing are remembered briefly, separately from results
+    NEGATIVE_CACHE_SIZE = int(os.getenv("NEGATIVE_CACHE_SIZE", "1024"))
+    NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "60"))
+    # Gemini context caching for the static Cypher system prompt (opt-in)
+    GEMINI_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() == "true"
+    GEMINI_CACHE_TTL = os.getenv("GEMINI_CACHE_TTL", "3600s")
+
     # Visualization settings
     GRAPH_HEIGHT = "700px"
     GRAPH_WIDTH = "100%"
+    # Visualizer statistics cached by a digest of the graph data (opt-in)
+    VIZ_STATS_CACHE = os.getenv("VIZ_STATS_CACHE", "false").lower() == "true"
+    # Rendered pages kept on disk; least recently used ones are removed past this
+    VIZ_HTML_CACHE_MAX_FILES = int(os.getenv("VIZ_HTML_CACHE_MAX_FILES", "64"))
     
     @classmethod
     def validate(cls) -> Dict[str, Any]:
@@ -76,3 +111,8 @@ class Config:
 
 # Create a global config instance
 config = Config()
+
+# Settings are fixed once the environment is loaded, so the display dict is
+# built once; read-only to keep it shared safely
+CONFIG_DICT: Mapping[str, Any] = MappingProxyType(Config.get_config_dict())
+
@@ -1,31 +1,118 @@
 """
 Embedded Graph Manager module for GraphNet.
-Provides in-memory graph storage using NetworkX (no Neo4j required).
+Provides in-memory graph storage using plain adjacency lists (no Neo4j required).
 """
 
+import atexit
 import logging
+import os
 import pickle
-from typing import List, Dict, Any, Optional
-import networkx as nx
+import queue
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, List, Dict, Any, Iterator, Optional, Set, Tuple
+import networkx as nx  # Only to load snapshots saved as a pickled MultiDiGraph
 from datetime import datetime
 import json
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+from config import config
+
 logger = logging.getLogger(__name__)
 
+# Write buffer for graph saves; fewer, larger syscalls for big graphs
+_PERSIST_BUFFER_SIZE = 1 << 20
+
+# Seconds an ISO 'created'/'updated' timestamp string is reused for
+_TIMESTAMP_RESOLUTION = 0.5
+
+# Per-entity relationship lists memoized between graph changes
+_RELATIONSHIP_CACHE_SIZE = 1024
+# get_graph_data results memoized between graph changes, one per node limit
+_GRAPH_DATA_CACHE_SIZE = 8
+
+# Substring search uses a trigram index; shorter terms fall back to a scan
+_NGRAM = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    """All distinct _NGRAM-character substrings of text"""
+    return {text[i:i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+class _Edge:
+    """A directed relationship, shared by its source's out-list and its target's in-list"""
+    __slots__ = ('source', 'target', 'attrs', 'outgoing_row', 'incoming_row')
+    
+    def __init__(self, source: str, target: str, attrs: Dict[str, Any]):
+        self.source = source
+        self.target = target
+        self.attrs = attrs
+        # get_entity_relationships rows as seen from each endpoint; an edge's
+        # type and endpoints never change, so each row is built once and reused
+        self.outgoing_row: Optional[Dict[str, Any]] = None
+        self.incoming_row: Optional[Dict[str, Any]] = None
+
 
 class EmbeddedGraphManager:
     """
-    Manages in-memory graph using NetworkX.
+    Manages an in-memory graph of attribute dicts and adjacency lists.
     Alternative to Neo4j - no database installation required!
     """
     
     def __init__(self, persist_file: str = "graphnet_data.pkl"):
         """Initialize the embedded graph manager"""
-        self.graph = nx.MultiDiGraph()  # Directed graph with multiple edges
+        # Node ID -> attributes, in creation order; edges live in per-node
+        # adjacency lists instead of NetworkX's dict-of-dict-of-dict storage
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._out: Dict[str, List[_Edge]] = {}
+        self._in: Dict[str, List[_Edge]] = {}
+        self._edge_count = 0
+        # Bumped on every change, property updates included; memoized reads
+        # are keyed on it, so entries from before a write simply stop matching
+        self._version = 0
+        self._cached_relationships = lru_cache(maxsize=_RELATIONSHIP_CACHE_SIZE)(
+            self._walk_relationships
+        )
+        self._cached_graph_data = lru_cache(maxsize=_GRAPH_DATA_CACHE_SIZE)(
+            self._build_graph_data
+        )
+        # Entity name -> node IDs (one per type), in creation order
+        self._name_index: Dict[str, List[str]] = defaultdict(list)
+        # (lowercased name, node ID) pairs, so searches don't re-lower every name
+        self._names_lower: List[tuple] = []
+        # Trigram -> positions in _names_lower. Built lazily by searches:
+        # _names_lower only grows, so names past _ngram_indexed are just appended
+        self._ngram_index: Dict[str, Set[int]] = defaultdict(set)
+        self._ngram_indexed = 0
+        # Node counts per entity type and edge counts per relationship type,
+        # kept current by the mutators so stats never rescan the graph
+        self._type_counts: Counter = Counter()
+        self._rel_counts: Counter = Counter()
         self.persist_file = persist_file
         self.connected = False
+        # Writes are appended to a write-ahead log next to the snapshot; the
+        # snapshot is only rewritten every EMBEDDED_SNAPSHOT_OPS writes and on close
+        self._wal_file = f"{persist_file}.wal"
+        self._wal = None
+        # Snapshots are pickled by a writer thread. Each one rotates the log to a
+        # numbered segment (<wal>.<seq>) and records that seq, so segments it
+        # covers can be dropped once it is on disk and later ones are replayed
+        self._wal_seq = 0
+        self._snapshots: queue.Queue = queue.Queue(maxsize=1)
+        self._persist_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._wal_ops = 0
+        self._dirty = False  # Snapshot is behind the in-memory graph
+        self._autopersist = True
+        self._last_sync = 0.0
+        self._last_timestamp = ""
+        self._last_timestamp_at = 0.0
+        atexit.register(self.close)
         
     def connect(self) -> bool:
         """
@@ -36,13 +123,25 @@ class EmbeddedGraphManager:
         """
         try:
             # Try to load existing graph
+            self._reset()
+            snapshot_seq = 0
             try:
                 with open(self.persist_file, 'rb') as f:
-                    self.graph = pickle.load(f)
+                    snapshot_seq = self._load_snapshot(pickle.load(f))
                 logger.info(f"Loaded existing graph from {self.persist_file}")
             except FileNotFoundError:
                 logger.info("Creating new graph (no existing data found)")
-                self.graph = nx.MultiDiGraph()
+            self._rebuild_indexes()
+            
+            # Writes made after the last snapshot
+            self._wal_ops = self._replay_wal(snapshot_seq)
+            self._dirty = self._wal_ops > 0
+            self._last_sync = time.monotonic()
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_snapshots, name="graphnet-persist", daemon=True
+                )
+                self._writer.start()
             
             self.connected = True
             logger.info("✓ Embedded graph initialized successfully")
@@ -53,22 +152,282 @@ class EmbeddedGraphManager:
             self.connected = False
             return False
     
+    def ensure_indexes(self, labels: Iterable[str] = ()) -> bool:
+        """
+        Counterpart of GraphManager.ensure_indexes; name lookups here always go
+        through the in-memory name index, so there is nothing to create
+        
+        Returns:
+            Boolean indicating connection status
+        """
+        return self.connected
+    
     def close(self):
         """Save and close the graph"""
         if self.connected:
-            self._persist()
+            if self._dirty:
+                self._persist()
+            # Let the writer finish whatever snapshot is still pending
+            self._snapshots.put(None)
+            self._writer.join()
+            self._writer = None
+            if self._wal:
+                self._wal.close()
+                self._wal = None
             self.connected = False
             logger.info("Embedded graph saved and closed")
     
+    def flush(self):
+        """Force logged writes through to disk"""
+        if self._wal:
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self._last_sync = time.monotonic()
+    
+    @contextmanager
+    def bulk_update(self) -> Iterator[None]:
+        """Suspend per-write log flushes and snapshots for a batch of writes"""
+        previous = self._autopersist
+        self._autopersist = False
+        try:
+            yield
+        finally:
+            self._autopersist = previous
+            if previous:
+                self._after_write()
+    
+    def _reset(self):
+        """Drop all nodes and edges"""
+        self._nodes = {}
+        self._out = {}
+        self._in = {}
+        self._edge_count = 0
+        self._version += 1
+        self._cached_relationships.cache_clear()
+        self._cached_graph_data.cache_clear()
+    
+    def _clear(self):
+        """Drop all nodes and edges along with the lookup indexes and counts"""
+        self._reset()
+        self._name_index.clear()
+        self._names_lower.clear()
+        self._ngram_index.clear()
+        self._ngram_indexed = 0
+        self._type_counts.clear()
+        self._rel_counts.clear()
+    
+    def _insert_node(self, node_id: str, attrs: Dict[str, Any]):
+        """Store a node with empty adjacency lists"""
+        self._nodes[node_id] = attrs
+        self._out[node_id] = []
+        self._in[node_id] = []
+        self._version += 1
+    
+    def _insert_edge(self, source_id: str, target_id: str, attrs: Dict[str, Any]):
+        """Store an edge between two existing nodes"""
+        edge = _Edge(source_id, target_id, attrs)
+        self._out[source_id].append(edge)
+        self._in[target_id].append(edge)
+        self._edge_count += 1
+        self._version += 1
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        """
+        Columnar snapshot for pickling: node IDs and attributes as parallel
+        lists, and edge endpoints as int arrays of node positions, which pickle
+        as raw bytes instead of a repeated ID string per edge
+        """
+        position = {node_id: i for i, node_id in enumerate(self._nodes)}
+        edge_source = array('i')
+        edge_target = array('i')
+        edge_attrs = []
+        for out_edges in self._out.values():
+            for edge in out_edges:
+                edge_source.append(position[edge.source])
+                edge_target.append(position[edge.target])
+                edge_attrs.append(edge.attrs)
+        return {
+            'version': 2,
+            'node_ids': list(self._nodes),
+            # Copied: entity updates change node dicts in place while the
+            # writer thread is still pickling (edge attributes never change)
+            'node_attrs': [dict(attrs) for attrs in self._nodes.values()],
+            'edge_source': edge_source,
+            'edge_target': edge_target,
+            'edge_attrs': edge_attrs,
+            'wal_seq': self._wal_seq,
+        }
+    
+    def _load_snapshot(self, snapshot) -> int:
+        """
+        Load a columnar snapshot, an older (nodes, edges) one, or a pickled
+        NetworkX graph; returns the last log segment the snapshot covers
+        """
+        if isinstance(snapshot, dict):
+            node_ids = snapshot['node_ids']
+            for node_id, attrs in zip(node_ids, snapshot['node_attrs']):
+                self._insert_node(node_id, attrs)
+            for source, target, attrs in zip(snapshot['edge_source'], snapshot['edge_target'],
+                                             snapshot['edge_attrs']):
+                self._insert_edge(node_ids[source], node_ids[target], attrs)
+            return snapshot.get('wal_seq', 0)
+        
+        if isinstance(snapshot, nx.MultiDiGraph):
+            nodes = snapshot.nodes(data=True)
+            edges = snapshot.edges(data=True)
+        else:
+            nodes, edges = snapshot
+        for node_id, attrs in nodes:
+            self._insert_node(node_id, dict(attrs))
+        # Earlier snapshots stored (source, target, key, attrs)
+        for *endpoints, attrs in edges:
+            self._insert_edge(endpoints[0], endpoints[1], dict(attrs))
+        return 0
+    
+    def _rebuild_indexes(self):
+        """Recompute lookup indexes from the graph (after loading a snapshot)"""
+        self._name_index = defaultdict(list)
+        self._names_lower = []
+        self._ngram_index = defaultdict(set)
+        self._ngram_indexed = 0
+        for node_id, attrs in self._nodes.items():
+            name = attrs.get('name', '')
+            self._name_index[name].append(node_id)
+            self._names_lower.append((name.lower(), node_id))
+        self._type_counts = Counter(
+            attrs.get('type', 'Unknown') for attrs in self._nodes.values()
+        )
+        self._rel_counts = Counter(
+            edge.attrs.get('type', 'RELATED_TO')
+            for out_edges in self._out.values() for edge in out_edges
+        )
+    
+    def _timestamp(self) -> str:
+        """Current local time in ISO format, re-formatted at most every _TIMESTAMP_RESOLUTION seconds"""
+        now = time.time()
+        if now - self._last_timestamp_at >= _TIMESTAMP_RESOLUTION:
+            self._last_timestamp = datetime.fromtimestamp(now).isoformat()
+            self._last_timestamp_at = now
+        return self._last_timestamp
+    
+    def _log(self, op: list):
+        """Append one write operation to the write-ahead log"""
+        if self._wal is None:
+            # Opened on first write, so read-only sessions leave no log behind
+            self._wal = open(self._wal_file, 'a', encoding='utf-8')
+        self._wal.write(json.dumps(op, default=str) + "\n")
+        self._wal_ops += 1
+        self._dirty = True
+    
+    def _after_write(self):
+        """Snapshot once enough writes are logged; otherwise flush the log (fsync periodically)"""
+        if not self._autopersist:
+            return
+        if self._wal_ops >= config.EMBEDDED_SNAPSHOT_OPS:
+            self._persist()
+        elif time.monotonic() - self._last_sync >= config.EMBEDDED_PERSIST_INTERVAL:
+            self.flush()
+        elif self._wal:
+            self._wal.flush()
+    
+    def _wal_segments(self) -> List[int]:
+        """Sequence numbers of rotated log segments on disk, oldest first"""
+        directory = os.path.dirname(self._wal_file) or "."
+        prefix = f"{os.path.basename(self._wal_file)}."
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            int(name[len(prefix):]) for name in names
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        )
+    
+    def _replay_wal(self, snapshot_seq: int = 0) -> int:
+        """Apply writes logged since the last snapshot; returns how many were applied"""
+        applied = 0
+        segments = self._wal_segments()
+        self._wal_seq = max([snapshot_seq] + segments)
+        paths = []
+        for seq in segments:
+            path = f"{self._wal_file}.{seq}"
+            if seq <= snapshot_seq:
+                # Already in the snapshot; left behind by an interrupted cleanup
+                os.remove(path)
+            else:
+                paths.append(path)
+        paths.append(self._wal_file)
+        
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except json.JSONDecodeError:
+                            # A torn final line from an interrupted write
+                            logger.warning(f"Ignoring incomplete entry in {path}")
+                            break
+                        if op[0] == 'E':
+                            self._add_entity(*op[1:])
+                        elif op[0] == 'R':
+                            self._add_relationship(*op[1:])
+                        elif op[0] == 'C':
+                            self._clear()
+                        applied += 1
+            except FileNotFoundError:
+                pass
+        if applied:
+            logger.info(f"Replayed {applied} logged writes from {self._wal_file}")
+        return applied
+    
     def _persist(self):
-        """Save graph to disk"""
+        """Rotate the write-ahead log and queue a full snapshot for the writer thread"""
         try:
-            with open(self.persist_file, 'wb') as f:
-                pickle.dump(self.graph, f)
-            logger.info(f"Graph persisted to {self.persist_file}")
+            with self._persist_lock:
+                if self._wal:
+                    self._wal.flush()
+                    os.fsync(self._wal.fileno())
+                    self._wal.close()
+                    self._wal = None
+                # Also rotates a log replayed at connect but not written since,
+                # which the snapshot now covers
+                if os.path.exists(self._wal_file):
+                    self._wal_seq += 1
+                    os.replace(self._wal_file, f"{self._wal_file}.{self._wal_seq}")
+                snapshot = self._snapshot()
+                # Single slot: a snapshot still waiting is stale, so replace it
+                try:
+                    self._snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+                self._snapshots.put_nowait(snapshot)
+            self._wal_ops = 0
+            self._dirty = False
+            self._last_sync = time.monotonic()
         except Exception as e:
             logger.error(f"Error persisting graph: {str(e)}")
     
+    def _write_snapshots(self):
+        """Writer thread: save queued snapshots atomically, then drop the log segments they cover"""
+        while True:
+            snapshot = self._snapshots.get()
+            if snapshot is None:
+                return
+            try:
+                temp_file = f"{self.persist_file}.tmp"
+                with open(temp_file, 'wb', buffering=_PERSIST_BUFFER_SIZE) as f:
+                    pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.persist_file)
+                for seq in self._wal_segments():
+                    if seq <= snapshot['wal_seq']:
+                        os.remove(f"{self._wal_file}.{seq}")
+                logger.info(f"Graph persisted to {self.persist_file}")
+            except Exception as e:
+                logger.error(f"Error persisting graph: {str(e)}")
+    
     def create_entity(self, entity_name: str, entity_type: str, 
                      properties: Dict[str, Any] = None, source: str = None) -> bool:
         """
@@ -88,32 +447,79 @@ class EmbeddedGraphManager:
             return False
         
         try:
-            # Create node ID
-            node_id = f"{entity_type}:{entity_name}"
-            
-            # Prepare node attributes
-            attrs = properties or {}
-            attrs['name'] = entity_name
-            attrs['type'] = entity_type
-            attrs['source'] = source
-            
-            # Check if node exists
-            if self.graph.has_node(node_id):
-                # Update existing node
-                self.graph.nodes[node_id].update(attrs)
-                self.graph.nodes[node_id]['updated'] = datetime.now().isoformat()
-            else:
-                # Create new node
-                attrs['created'] = datetime.now().isoformat()
-                self.graph.add_node(node_id, **attrs)
-            
-            self._persist()  # Save after each operation
+            timestamp = self._timestamp()
+            self._add_entity(entity_name, entity_type, properties, source, timestamp)
+            self._log(['E', entity_name, entity_type, properties, source, timestamp])
+            self._after_write()
             return True
             
         except Exception as e:
             logger.error(f"Error creating entity: {str(e)}")
             return False
     
+    def _add_entity(self, entity_name: str, entity_type: str,
+                    properties: Dict[str, Any] = None, source: str = None,
+                    timestamp: str = None):
+        """Add or update an entity node in memory without persisting"""
+        timestamp = timestamp or self._timestamp()
+        # Create node ID
+        node_id = f"{entity_type}:{entity_name}"
+        
+        # Prepare node attributes (copied so the caller's dict, which may
+        # also be logged, is left untouched)
+        attrs = dict(properties or {})
+        attrs['name'] = entity_name
+        attrs['type'] = entity_type
+        attrs['source'] = source
+        
+        # Check if node exists
+        node = self._nodes.get(node_id)
+        if node is not None:
+            # Update existing node
+            node.update(attrs)
+            node['updated'] = timestamp
+            self._version += 1
+        else:
+            # Create new node
+            attrs['created'] = timestamp
+            self._create_node(node_id, entity_name, entity_type, attrs)
+    
+    def _create_node(self, node_id: str, entity_name: str, entity_type: str,
+                     attrs: Dict[str, Any]):
+        """Insert a node known not to exist yet and register it in the indexes"""
+        self._insert_node(node_id, attrs)
+        self._name_index[entity_name].append(node_id)
+        self._names_lower.append((entity_name.lower(), node_id))
+        self._type_counts[entity_type] += 1
+    
+    def create_entities(self, entities: List[Dict[str, Any]]) -> int:
+        """
+        Create or update many entities, flushing the write log once at the end
+        
+        Args:
+            entities: Dicts with 'name', 'type' and optional 'properties' and 'source'
+        
+        Returns:
+            Number of entities written
+        """
+        if not self.connected:
+            logger.error("Not connected to graph")
+            return 0
+        
+        added = 0
+        timestamp = self._timestamp()  # One timestamp for the whole batch
+        with self.bulk_update():
+            for entity in entities:
+                try:
+                    op = ['E', entity['name'], entity['type'], entity.get('properties'),
+                          entity.get('source'), timestamp]
+                    self._add_entity(*op[1:])
+                    self._log(op)
+                    added += 1
+                except Exception as e:
+                    logger.error(f"Error creating entity: {str(e)}")
+        return added
+    
     def create_relationship(self, source_entity: str, source_type: str,
                           target_entity: str, target_type: str,
                           relationship_type: str, properties: Dict[str, Any] = None) -> bool:
@@ -136,29 +542,87 @@ class EmbeddedGraphManager:
             return False
         
         try:
-            source_id = f"{source_type}:{source_entity}"
-            target_id = f"{target_type}:{target_entity}"
-            
-            # Ensure both nodes exist
-            if not self.graph.has_node(source_id):
-                self.create_entity(source_entity, source_type)
-            if not self.graph.has_node(target_id):
-                self.create_entity(target_entity, target_type)
-            
-            # Add edge with properties
-            attrs = properties or {}
-            attrs['type'] = relationship_type
-            attrs['created'] = datetime.now().isoformat()
-            
-            self.graph.add_edge(source_id, target_id, **attrs)
-            
-            self._persist()
+            op = ['R', source_entity, source_type, target_entity, target_type,
+                  relationship_type, properties, self._timestamp()]
+            self._add_relationship(*op[1:])
+            self._log(op)
+            self._after_write()
             return True
             
         except Exception as e:
             logger.error(f"Error creating relationship: {str(e)}")
             return False
     
+    def _add_relationship(self, source_entity: str, source_type: str,
+                          target_entity: str, target_type: str,
+                          relationship_type: str, properties: Dict[str, Any] = None,
+                          timestamp: str = None):
+        """Add a relationship edge in memory (creating missing endpoints) without persisting"""
+        timestamp = timestamp or self._timestamp()
+        source_id = f"{source_type}:{source_entity}"
+        target_id = f"{target_type}:{target_entity}"
+        
+        # Ensure both nodes exist (one membership probe each)
+        for node_id, name, node_type in ((source_id, source_entity, source_type),
+                                         (target_id, target_entity, target_type)):
+            if node_id not in self._nodes:
+                self._create_node(node_id, name, node_type, {
+                    'name': name, 'type': node_type, 'source': None, 'created': timestamp
+                })
+        
+        # Add edge with properties
+        attrs = dict(properties or {})
+        attrs['type'] = relationship_type
+        attrs['created'] = timestamp
+        
+        self._insert_edge(source_id, target_id, attrs)
+        self._rel_counts[relationship_type] += 1
+    
+    def create_relationships(self, relationships: List[Dict[str, Any]]) -> int:
+        """
+        Create many relationships, flushing the write log once at the end
+        
+        Args:
+            relationships: Dicts with 'source', 'source_type', 'target', 'target_type',
+                'type' and optional 'properties'
+        
+        Returns:
+            Number of relationships written
+        """
+        if not self.connected:
+            logger.error("Not connected to graph")
+            return 0
+        
+        added = 0
+        timestamp = self._timestamp()  # One timestamp for the whole batch
+        with self.bulk_update():
+            for rel in relationships:
+                try:
+                    op = ['R', rel['source'], rel['source_type'], rel['target'],
+                          rel['target_type'], rel['type'], rel.get('properties'), timestamp]
+                    self._add_relationship(*op[1:])
+                    self._log(op)
+                    added += 1
+                except Exception as e:
+                    logger.error(f"Error creating relationship: {str(e)}")
+        return added
+    
+    def create_entities_and_relationships(self, entities: List[Dict[str, Any]],
+                                          relationships: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Create many entities and then many relationships, flushing the write
+        log (and snapshotting, if due) once for both
+        
+        Args:
+            entities: As for create_entities
+            relationships: As for create_relationships
+        
+        Returns:
+            Numbers of entities and relationships written
+        """
+        with self.bulk_update():
+            return self.create_entities(entities), self.create_relationships(relationships)
+    
     def get_entity(self, entity_name: str, entity_type: str = None) -> Optional[Dict[str, Any]]:
         """
         Retrieve an entity from the graph
@@ -177,13 +641,12 @@ class EmbeddedGraphManager:
             # Try with type first
             if entity_type:
                 node_id = f"{entity_type}:{entity_name}"
-                if self.graph.has_node(node_id):
-                    return dict(self.graph.nodes[node_id])
+                if node_id in self._nodes:
+                    return dict(self._nodes[node_id])
             
-            # Search all nodes
-            for node_id in self.graph.nodes():
-                if self.graph.nodes[node_id].get('name') == entity_name:
-                    return dict(self.graph.nodes[node_id])
+            # Fall back to the first node with this name, of any type
+            for node_id in self._name_index.get(entity_name, ()):
+                return dict(self._nodes[node_id])
             
             return None
             
@@ -211,42 +674,53 @@ class EmbeddedGraphManager:
             if entity_type:
                 node_id = f"{entity_type}:{entity_name}"
             else:
-                for nid in self.graph.nodes():
-                    if self.graph.nodes[nid].get('name') == entity_name:
-                        node_id = nid
-                        break
+                node_ids = self._name_index.get(entity_name)
+                node_id = node_ids[0] if node_ids else None
             
-            if not node_id or not self.graph.has_node(node_id):
+            if not node_id or node_id not in self._nodes:
                 return []
             
-            relationships = []
-            
-            # Outgoing edges
-            for target in self.graph.successors(node_id):
-                for edge_data in self.graph.get_edge_data(node_id, target).values():
-                    relationships.append({
-                        'relationship': edge_data.get('type', 'RELATED_TO'),
-                        'entity': self.graph.nodes[target].get('name', 'Unknown'),
-                        'labels': [self.graph.nodes[target].get('type', 'Unknown')],
-                        'direction': 'outgoing'
-                    })
-            
-            # Incoming edges
-            for source in self.graph.predecessors(node_id):
-                for edge_data in self.graph.get_edge_data(source, node_id).values():
-                    relationships.append({
-                        'relationship': edge_data.get('type', 'RELATED_TO'),
-                        'entity': self.graph.nodes[source].get('name', 'Unknown'),
-                        'labels': [self.graph.nodes[source].get('type', 'Unknown')],
-                        'direction': 'incoming'
-                    })
-            
-            return relationships
+            # Rows are memoized on the edges and shared by every call, so
+            # callers get copies (labels included) they are free to modify
+            return [
+                dict(row, labels=list(row['labels']))
+                for row in self._cached_relationships(node_id, self._version)
+            ]
             
         except Exception as e:
             logger.error(f"Error getting relationships: {str(e)}")
             return []
     
+    def _walk_relationships(self, node_id: str, version: int) -> tuple:
+        """Relationships of one node as of graph `version` (memoized; rows are shared, never hand them out)"""
+        relationships = []
+        
+        # Outgoing edges
+        for edge in self._out[node_id]:
+            if edge.outgoing_row is None:
+                target = self._nodes[edge.target]
+                edge.outgoing_row = {
+                    'relationship': edge.attrs.get('type', 'RELATED_TO'),
+                    'entity': target.get('name', 'Unknown'),
+                    'labels': [target.get('type', 'Unknown')],
+                    'direction': 'outgoing'
+                }
+            relationships.append(edge.outgoing_row)
+        
+        # Incoming edges
+        for edge in self._in[node_id]:
+            if edge.incoming_row is None:
+                source = self._nodes[edge.source]
+                edge.incoming_row = {
+                    'relationship': edge.attrs.get('type', 'RELATED_TO'),
+                    'entity': source.get('name', 'Unknown'),
+                    'labels': [source.get('type', 'Unknown')],
+                    'direction': 'incoming'
+                }
+            relationships.append(edge.incoming_row)
+        
+        return tuple(relationships)
+    
     def search_entities(self, search_term: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search for entities by name
@@ -262,26 +736,45 @@ class EmbeddedGraphManager:
             return []
         
         try:
-            results = []
             search_lower = search_term.lower()
             
-            for node_id in self.graph.nodes():
-                name = self.graph.nodes[node_id].get('name', '')
-                if search_lower in name.lower():
-                    results.append({
-                        'name': name,
-                        'types': [self.graph.nodes[node_id].get('type', 'Unknown')]
-                    })
-                    
-                    if len(results) >= limit:
-                        break
-            
-            return results
+            # Lazily filtered, so the scan stops as soon as `limit` matches are found
+            names = self._names_lower
+            matches = (self._nodes[names[i][1]] for i in self._name_candidates(search_lower)
+                       if search_lower in names[i][0])
+            return [
+                {'name': node.get('name', ''), 'types': [node.get('type', 'Unknown')]}
+                for node in islice(matches, max(0, limit))
+            ]
             
         except Exception as e:
             logger.error(f"Error searching entities: {str(e)}")
             return []
     
+    def _name_candidates(self, search_lower: str) -> Iterator[int]:
+        """
+        Positions in _names_lower that may contain search_lower, in creation
+        order: names sharing every trigram of the term, or all names for
+        terms too short to have one
+        """
+        grams = _ngrams(search_lower)
+        if not grams:
+            return iter(range(len(self._names_lower)))
+        
+        # Catch the index up with names added since the last search
+        for i in range(self._ngram_indexed, len(self._names_lower)):
+            for gram in _ngrams(self._names_lower[i][0]):
+                self._ngram_index[gram].add(i)
+        self._ngram_indexed = len(self._names_lower)
+        
+        postings = sorted((self._ngram_index.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return iter(sorted(candidates))
+    
     def get_graph_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the graph
@@ -293,37 +786,19 @@ class EmbeddedGraphManager:
             return {}
         
         try:
-            # Count nodes
-            node_count = self.graph.number_of_nodes()
-            
-            # Count edges
-            edge_count = self.graph.number_of_edges()
-            
-            # Count by type
-            type_counts = {}
-            for node_id in self.graph.nodes():
-                node_type = self.graph.nodes[node_id].get('type', 'Unknown')
-                type_counts[node_type] = type_counts.get(node_type, 0) + 1
-            
+            # Per-type counts are maintained incrementally by the mutators
             node_types = [
                 {'labels': [ntype], 'count': count}
-                for ntype, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True)
+                for ntype, count in self._type_counts.most_common()
             ]
-            
-            # Count relationship types
-            rel_counts = {}
-            for u, v, data in self.graph.edges(data=True):
-                rel_type = data.get('type', 'RELATED_TO')
-                rel_counts[rel_type] = rel_counts.get(rel_type, 0) + 1
-            
             rel_types = [
                 {'type': rtype, 'count': count}
-                for rtype, count in sorted(rel_counts.items(), key=lambda x: x[1], reverse=True)
+                for rtype, count in self._rel_counts.most_common()
             ]
             
             return {
-                'node_count': node_count,
-                'relationship_count': edge_count,
+                'node_count': len(self._nodes),
+                'relationship_count': self._edge_count,
                 'node_types': node_types,
                 'relationship_types': rel_types
             }
@@ -343,7 +818,13 @@ class EmbeddedGraphManager:
             return False
         
         try:
-            self.graph.clear()
+            self._clear()
+            # Logged and synced before returning: the empty snapshot is
+            # written in the background, and until it lands a restart would
+            # otherwise reload the old snapshot and log
+            self._log(['C'])
+            self.flush()
+            # An empty snapshot is cheap and supersedes everything logged
             self._persist()
             logger.info("Graph cleared successfully")
             return True
@@ -352,6 +833,11 @@ class EmbeddedGraphManager:
             logger.error(f"Error clearing graph: {str(e)}")
             return False
     
+    @property
+    def version(self) -> int:
+        """Changes whenever the graph does; equal versions give equal get_graph_data results"""
+        return self._version
+    
     def get_graph_data(self, limit: int = 100) -> Dict[str, Any]:
         """
         Get graph data for visualization
@@ -360,46 +846,61 @@ class EmbeddedGraphManager:
             limit: Maximum number of nodes to return
         
         Returns:
-            Dictionary containing nodes and edges
+            Dictionary containing nodes and edges. The node and edge dicts are
+            shared by every call until the graph changes and must not be
+            modified; 'properties' are copies, so later writes don't show
+            through results already handed out
         """
         if not self.connected:
             return {"nodes": [], "edges": []}
         
         try:
-            nodes = []
-            edges = []
-            
-            # Get nodes (limited)
-            node_list = list(self.graph.nodes())[:limit]
-            
-            for node_id in node_list:
-                node_data = self.graph.nodes[node_id]
-                nodes.append({
-                    'id': node_id,
-                    'label': node_data.get('name', 'Unknown'),
-                    'type': node_data.get('type', 'Unknown'),
-                    'properties': dict(node_data)
-                })
-            
-            # Get edges between these nodes
-            for u, v, data in self.graph.edges(data=True):
-                if u in node_list and v in node_list:
-                    edges.append({
-                        'source': u,
-                        'target': v,
-                        'type': data.get('type', 'RELATED_TO'),
-                        'properties': dict(data)
-                    })
-            
+            # Statistics and the visualization ask for the same data back to
+            # back; memoized per limit until the next structural change
+            graph_data = self._cached_graph_data(max(0, limit), self._version)
             return {
-                "nodes": nodes,
-                "edges": edges
+                "nodes": list(graph_data["nodes"]),
+                "edges": list(graph_data["edges"])
             }
             
         except Exception as e:
             logger.error(f"Error getting graph data: {str(e)}")
             return {"nodes": [], "edges": []}
     
+    def _build_graph_data(self, limit: int, version: int) -> Dict[str, Any]:
+        """get_graph_data's result for the graph as of version (only part of the cache key)"""
+        nodes = []
+        edges = []
+        
+        # Get nodes (limited); the dict doubles as the membership set for edges
+        selected = dict(islice(self._nodes.items(), max(0, limit)))
+        
+        # Properties are copied once per version: _add_entity updates the
+        # stored dicts in place, which would otherwise rewrite earlier results
+        for node_id, node_data in selected.items():
+            nodes.append({
+                'id': node_id,
+                'label': node_data.get('name', 'Unknown'),
+                'type': node_data.get('type', 'Unknown'),
+                'properties': dict(node_data)
+            })
+        
+        # Get edges between these nodes (only the selected nodes' out-lists)
+        for node_id in selected:
+            for edge in self._out[node_id]:
+                if edge.target in selected:
+                    edges.append({
+                        'source': node_id,
+                        'target': edge.target,
+                        'type': edge.attrs.get('type', 'RELATED_TO'),
+                        'properties': dict(edge.attrs)
+                    })
+        
+        return {
+            "nodes": nodes,
+            "edges": edges
+        }
+    
     def query_graph(self, query: str, parameters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Execute a simple query (limited functionality compared to Cypher)
@@ -424,15 +925,15 @@ class EmbeddedGraphManager:
             # Simple pattern matching for common queries
             if 'match (n)' in query_lower or 'show' in query_lower or 'all' in query_lower:
                 # Return all nodes
-                for node_id in list(self.graph.nodes())[:100]:
+                for node_data in islice(self._nodes.values(), 100):
                     results.append({
-                        'n': dict(self.graph.nodes[node_id])
+                        'n': dict(node_data)
                     })
             
             elif 'count' in query_lower:
                 # Return count
                 results.append({
-                    'count': self.graph.number_of_nodes()
+                    'count': len(self._nodes)
                 })
             
             return results
@@ -4,16 +4,77 @@ Handles all Neo4j database operations including entity and relationship manageme
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from neo4j import GraphDatabase
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
+from neo4j import READ_ACCESS, GraphDatabase, Record, RoutingControl
 from neo4j.exceptions import ServiceUnavailable, AuthError
 from config import config
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _quote_name(name: str) -> str:
+    """Backtick-quote a label or relationship type for interpolation into Cypher"""
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+# Labels and relationship types can't be query parameters, so statements are
+# built once per label combination and reused verbatim; identical query text
+# lets Neo4j serve them from its plan cache. Everything else is a parameter.
+
+@lru_cache(maxsize=256)
+def _merge_entities_query(entity_type: str) -> str:
+    """Batched MERGE of entities with one label"""
+    return f"""
+    UNWIND $rows AS row
+    MERGE (e:{_quote_name(entity_type)} {{name: row.name}})
+    ON CREATE SET e.created = timestamp(), e.source = row.source
+    ON MATCH SET e.updated = timestamp()
+    SET e += row.properties
+    """
+
+
+@lru_cache(maxsize=256)
+def _merge_relationships_query(source_type: str, target_type: str, relationship_type: str) -> str:
+    """Batched MERGE of relationships of one type between two labels"""
+    return f"""
+    UNWIND $rows AS row
+    MATCH (source:{_quote_name(source_type)} {{name: row.source_name}})
+    MATCH (target:{_quote_name(target_type)} {{name: row.target_name}})
+    MERGE (source)-[r:{_quote_name(relationship_type)}]->(target)
+    ON CREATE SET r.created = timestamp()
+    ON MATCH SET r.updated = timestamp()
+    SET r += row.properties
+    """
+
+
+# Visualization/export slice: up to $limit nodes and their outgoing
+# relationships. LIMIT is a parameter so every limit shares one cached plan
+_GRAPH_DATA_QUERY = """
+MATCH (n)
+WITH n LIMIT $limit
+OPTIONAL MATCH (n)-[r]->(m)
+RETURN n, r, m
+"""
+
+
+@lru_cache(maxsize=256)
+def _name_index_query(label: str) -> str:
+    """Create the index that entity MERGEs and MATCHes on name use for one label"""
+    return (f"CREATE INDEX {_quote_name('name_' + label)} IF NOT EXISTS "
+            f"FOR (n:{_quote_name(label)}) ON (n.name)")
+
+
+@lru_cache(maxsize=256)
+def _match_entity_pattern(entity_type: Optional[str]) -> str:
+    """Node pattern for an entity by $name, optionally restricted to one label"""
+    if entity_type:
+        return f"(e:{_quote_name(entity_type)} {{name: $name}})"
+    return "(e {name: $name})"
+
+
 class GraphManager:
     """Manages Neo4j graph database operations"""
     
@@ -21,6 +82,8 @@ class GraphManager:
         """Initialize connection to Neo4j database"""
         self.driver = None
         self.connected = False
+        # Labels known to have a name index (see ensure_indexes)
+        self._indexed_labels = set()
         
     def connect(self) -> bool:
         """
@@ -52,6 +115,46 @@ class GraphManager:
             self.connected = False
             return False
     
+    def _execute(self, query: str, parameters: Dict[str, Any] = None,
+                 routing: RoutingControl = RoutingControl.WRITE) -> List[Record]:
+        """
+        Run one auto-committed query via driver.execute_query, which borrows a
+        pooled session and retries transient failures itself
+        """
+        return self.driver.execute_query(query, parameters or {}, routing_=routing).records
+    
+    def ensure_indexes(self, labels: Iterable[str] = ()) -> bool:
+        """
+        Index n.name for the given labels, so MERGE and MATCH on an entity's name
+        are index lookups rather than label scans. The first call also covers
+        the generic 'Entity' label and every label already in the database;
+        labels indexed before are skipped without a round-trip.
+        
+        Args:
+            labels: Entity labels about to be written
+        
+        Returns:
+            Boolean indicating success
+        """
+        if not self.connected:
+            return False
+        
+        try:
+            wanted = set(labels)
+            if not self._indexed_labels:
+                wanted.add('Entity')
+                wanted.update(record['label'] for record in self._execute(
+                    "CALL db.labels() YIELD label RETURN label", routing=RoutingControl.READ
+                ))
+            # Schema changes can't share a transaction with data writes
+            for label in wanted - self._indexed_labels:
+                self._execute(_name_index_query(label))
+                self._indexed_labels.add(label)
+            return True
+        except Exception as e:
+            logger.error(f"Error creating indexes: {str(e)}")
+            return False
+    
     def close(self):
         """Close the database connection"""
         if self.driver:
@@ -73,28 +176,13 @@ class GraphManager:
         Returns:
             Boolean indicating success
         """
-        if not self.connected:
-            logger.error("Not connected to Neo4j")
-            return False
-        
-        try:
-            with self.driver.session() as session:
-                query = f"""
-                MERGE (e:{entity_type} {{name: $name}})
-                ON CREATE SET e.created = timestamp(), e.source = $source
-                ON MATCH SET e.updated = timestamp()
-                SET e += $properties
-                RETURN e
-                """
-                
-                props = properties or {}
-                props['name'] = entity_name
-                
-                session.run(query, name=entity_name, properties=props, source=source)
-                return True
-        except Exception as e:
-            logger.error(f"Error creating entity: {str(e)}")
-            return False
+        # Single writes share the batched UNWIND path (and its write transaction)
+        return self.create_entities([{
+            'name': entity_name,
+            'type': entity_type,
+            'properties': properties,
+            'source': source
+        }]) == 1
     
     def create_relationship(self, source_entity: str, source_type: str,
                           target_entity: str, target_type: str,
@@ -113,34 +201,152 @@ class GraphManager:
         Returns:
             Boolean indicating success
         """
+        return self.create_relationships([{
+            'source': source_entity,
+            'source_type': source_type,
+            'target': target_entity,
+            'target_type': target_type,
+            'type': relationship_type,
+            'properties': properties
+        }]) == 1
+    
+    def create_entities(self, entities: List[Dict[str, Any]]) -> int:
+        """
+        Create or update many entities in one write transaction.
+        Labels can't be parameters, so one UNWIND statement runs per entity type.
+        
+        Args:
+            entities: Dicts with 'name', 'type' and optional 'properties' and 'source'
+        
+        Returns:
+            Number of entities written (0 if the transaction failed)
+        """
         if not self.connected:
             logger.error("Not connected to Neo4j")
-            return False
+            return 0
+        if not entities:
+            return 0
+        
+        rows_by_type = self._entity_rows_by_type(entities)
+        self.ensure_indexes(rows_by_type)
+        
+        def write(tx):
+            self._write_entity_rows(tx, rows_by_type)
         
         try:
             with self.driver.session() as session:
-                query = f"""
-                MATCH (source:{source_type} {{name: $source_name}})
-                MATCH (target:{target_type} {{name: $target_name}})
-                MERGE (source)-[r:{relationship_type}]->(target)
-                ON CREATE SET r.created = timestamp()
-                ON MATCH SET r.updated = timestamp()
-                SET r += $properties
-                RETURN r
-                """
-                
-                props = properties or {}
-                
-                session.run(
-                    query,
-                    source_name=source_entity,
-                    target_name=target_entity,
-                    properties=props
-                )
-                return True
+                session.execute_write(write)
+            return len(entities)
         except Exception as e:
-            logger.error(f"Error creating relationship: {str(e)}")
-            return False
+            logger.error(f"Error creating entities: {str(e)}")
+            return 0
+    
+    def create_relationships(self, relationships: List[Dict[str, Any]]) -> int:
+        """
+        Create many relationships in one write transaction, one UNWIND statement
+        per (source type, target type, relationship type) combination.
+        
+        Args:
+            relationships: Dicts with 'source', 'source_type', 'target', 'target_type',
+                'type' and optional 'properties'
+        
+        Returns:
+            Number of relationships written (0 if the transaction failed)
+        """
+        if not self.connected:
+            logger.error("Not connected to Neo4j")
+            return 0
+        if not relationships:
+            return 0
+        
+        rows_by_shape = self._relationship_rows_by_shape(relationships)
+        self.ensure_indexes(chain.from_iterable(shape[:2] for shape in rows_by_shape))
+        
+        def write(tx):
+            self._write_relationship_rows(tx, rows_by_shape)
+        
+        try:
+            with self.driver.session() as session:
+                session.execute_write(write)
+            return len(relationships)
+        except Exception as e:
+            logger.error(f"Error creating relationships: {str(e)}")
+            return 0
+    
+    def create_entities_and_relationships(self, entities: List[Dict[str, Any]],
+                                          relationships: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Create many entities and then many relationships in a single write
+        transaction, so a document's extraction commits once
+        
+        Args:
+            entities: As for create_entities
+            relationships: As for create_relationships
+        
+        Returns:
+            Numbers of entities and relationships written ((0, 0) if the transaction failed)
+        """
+        if not self.connected:
+            logger.error("Not connected to Neo4j")
+            return 0, 0
+        if not entities and not relationships:
+            return 0, 0
+        
+        rows_by_type = self._entity_rows_by_type(entities)
+        rows_by_shape = self._relationship_rows_by_shape(relationships)
+        self.ensure_indexes(chain(rows_by_type, chain.from_iterable(shape[:2] for shape in rows_by_shape)))
+        
+        def write(tx):
+            # Entities first, so relationships can MATCH their endpoints
+            self._write_entity_rows(tx, rows_by_type)
+            self._write_relationship_rows(tx, rows_by_shape)
+        
+        try:
+            with self.driver.session() as session:
+                session.execute_write(write)
+            return len(entities), len(relationships)
+        except Exception as e:
+            logger.error(f"Error creating entities and relationships: {str(e)}")
+            return 0, 0
+    
+    @staticmethod
+    def _entity_rows_by_type(entities: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group entities into UNWIND rows per label"""
+        rows_by_type = defaultdict(list)
+        for entity in entities:
+            props = dict(entity.get('properties') or {})
+            props['name'] = entity['name']
+            rows_by_type[entity['type']].append({
+                'name': entity['name'],
+                'source': entity.get('source'),
+                'properties': props
+            })
+        return rows_by_type
+    
+    @staticmethod
+    def _relationship_rows_by_shape(relationships: List[Dict[str, Any]]) -> Dict[tuple, List[Dict[str, Any]]]:
+        """Group relationships into UNWIND rows per (source type, target type, type)"""
+        rows_by_shape = defaultdict(list)
+        for rel in relationships:
+            shape = (rel['source_type'], rel['target_type'], rel['type'])
+            rows_by_shape[shape].append({
+                'source_name': rel['source'],
+                'target_name': rel['target'],
+                'properties': rel.get('properties') or {}
+            })
+        return rows_by_shape
+    
+    @staticmethod
+    def _write_entity_rows(tx, rows_by_type: Dict[str, List[Dict[str, Any]]]):
+        """Run one batched entity MERGE per label in tx"""
+        for entity_type, rows in rows_by_type.items():
+            tx.run(_merge_entities_query(entity_type), rows=rows)
+    
+    @staticmethod
+    def _write_relationship_rows(tx, rows_by_shape: Dict[tuple, List[Dict[str, Any]]]):
+        """Run one batched relationship MERGE per shape in tx"""
+        for shape, rows in rows_by_shape.items():
+            tx.run(_merge_relationships_query(*shape), rows=rows)
     
     def query_graph(self, query: str, parameters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
@@ -158,9 +364,7 @@ class GraphManager:
             return []
         
         try:
-            with self.driver.session() as session:
-                result = session.run(query, parameters or {})
-                return [record.data() for record in result]
+            return [record.data() for record in self._execute(query, parameters)]
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
             return []
@@ -180,18 +384,12 @@ class GraphManager:
             return None
         
         try:
-            with self.driver.session() as session:
-                if entity_type:
-                    query = f"MATCH (e:{entity_type} {{name: $name}}) RETURN e"
-                else:
-                    query = "MATCH (e {name: $name}) RETURN e"
-                
-                result = session.run(query, name=entity_name)
-                record = result.single()
-                
-                if record:
-                    return dict(record['e'])
-                return None
+            query = f"MATCH {_match_entity_pattern(entity_type)} RETURN e LIMIT 1"
+            records = self._execute(query, {'name': entity_name}, RoutingControl.READ)
+            
+            if records:
+                return dict(records[0]['e'])
+            return None
         except Exception as e:
             logger.error(f"Error getting entity: {str(e)}")
             return None
@@ -211,20 +409,13 @@ class GraphManager:
             return []
         
         try:
-            with self.driver.session() as session:
-                if entity_type:
-                    query = f"""
-                    MATCH (e:{entity_type} {{name: $name}})-[r]-(other)
-                    RETURN type(r) as relationship, other.name as entity, labels(other) as labels
-                    """
-                else:
-                    query = """
-                    MATCH (e {name: $name})-[r]-(other)
-                    RETURN type(r) as relationship, other.name as entity, labels(other) as labels
-                    """
-                
-                result = session.run(query, name=entity_name)
-                return [record.data() for record in result]
+            query = f"""
+            MATCH {_match_entity_pattern(entity_type)}-[r]-(other)
+            RETURN type(r) as relationship, other.name as entity, labels(other) as labels
+            """
+            
+            records = self._execute(query, {'name': entity_name}, RoutingControl.READ)
+            return [record.data() for record in records]
         except Exception as e:
             logger.error(f"Error getting relationships: {str(e)}")
             return []
@@ -244,16 +435,16 @@ class GraphManager:
             return []
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (e)
-                WHERE e.name CONTAINS $search_term
-                RETURN e.name as name, labels(e) as types
-                LIMIT $limit
-                """
-                
-                result = session.run(query, search_term=search_term, limit=limit)
-                return [record.data() for record in result]
+            query = """
+            MATCH (e)
+            WHERE e.name CONTAINS $search_term
+            RETURN e.name as name, labels(e) as types
+            LIMIT $limit
+            """
+            
+            records = self._execute(query, {'search_term': search_term, 'limit': limit},
+                                    RoutingControl.READ)
+            return [record.data() for record in records]
         except Exception as e:
             logger.error(f"Error searching entities: {str(e)}")
             return []
@@ -269,37 +460,36 @@ class GraphManager:
             return {}
         
         try:
-            with self.driver.session() as session:
-                # Count nodes
-                node_result = session.run("MATCH (n) RETURN count(n) as count")
-                node_count = node_result.single()['count']
-                
-                # Count relationships
-                rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-                rel_count = rel_result.single()['count']
-                
-                # Get node types
-                type_result = session.run("""
-                    MATCH (n)
-                    RETURN labels(n) as labels, count(n) as count
-                    ORDER BY count DESC
-                """)
-                node_types = [record.data() for record in type_result]
-                
-                # Get relationship types
-                rel_type_result = session.run("""
-                    MATCH ()-[r]->()
-                    RETURN type(r) as type, count(r) as count
-                    ORDER BY count DESC
-                """)
-                rel_types = [record.data() for record in rel_type_result]
-                
-                return {
-                    "node_count": node_count,
-                    "relationship_count": rel_count,
-                    "node_types": node_types,
-                    "relationship_types": rel_types
-                }
+            read = RoutingControl.READ
+            
+            # Count nodes
+            node_count = self._execute("MATCH (n) RETURN count(n) as count", routing=read)[0]['count']
+            
+            # Count relationships
+            rel_count = self._execute("MATCH ()-[r]->() RETURN count(r) as count", routing=read)[0]['count']
+            
+            # Get node types
+            type_records = self._execute("""
+                MATCH (n)
+                RETURN labels(n) as labels, count(n) as count
+                ORDER BY count DESC
+            """, routing=read)
+            node_types = [record.data() for record in type_records]
+            
+            # Get relationship types
+            rel_type_records = self._execute("""
+                MATCH ()-[r]->()
+                RETURN type(r) as type, count(r) as count
+                ORDER BY count DESC
+            """, routing=read)
+            rel_types = [record.data() for record in rel_type_records]
+            
+            return {
+                "node_count": node_count,
+                "relationship_count": rel_count,
+                "node_types": node_types,
+                "relationship_types": rel_types
+            }
         except Exception as e:
             logger.error(f"Error getting graph stats: {str(e)}")
             return {}
@@ -315,10 +505,9 @@ class GraphManager:
             return False
         
         try:
-            with self.driver.session() as session:
-                session.run("MATCH (n) DETACH DELETE n")
-                logger.info("Graph cleared successfully")
-                return True
+            self._execute("MATCH (n) DETACH DELETE n")
+            logger.info("Graph cleared successfully")
+            return True
         except Exception as e:
             logger.error(f"Error clearing graph: {str(e)}")
             return False
@@ -337,53 +526,124 @@ class GraphManager:
             return {"nodes": [], "edges": []}
         
         try:
-            with self.driver.session() as session:
-                query = f"""
-                MATCH (n)
-                WITH n LIMIT {limit}
-                OPTIONAL MATCH (n)-[r]->(m)
-                RETURN n, r, m
-                """
-                
-                result = session.run(query)
-                
-                nodes = {}
-                edges = []
-                
-                for record in result:
-                    # Process source node
-                    if record['n']:
-                        node_id = record['n'].element_id
-                        if node_id not in nodes:
-                            nodes[node_id] = {
-                                'id': node_id,
-                                'label': record['n'].get('name', 'Unknown'),
-                                'type': list(record['n'].labels)[0] if record['n'].labels else 'Unknown',
-                                'properties': dict(record['n'])
-                            }
-                    
-                    # Process relationship and target node
-                    if record['r'] and record['m']:
-                        target_id = record['m'].element_id
-                        if target_id not in nodes:
-                            nodes[target_id] = {
-                                'id': target_id,
-                                'label': record['m'].get('name', 'Unknown'),
-                                'type': list(record['m'].labels)[0] if record['m'].labels else 'Unknown',
-                                'properties': dict(record['m'])
-                            }
-                        
-                        edges.append({
-                            'source': node_id,
-                            'target': target_id,
-                            'type': record['r'].type,
-                            'properties': dict(record['r'])
-                        })
-                
-                return {
-                    "nodes": list(nodes.values()),
-                    "edges": edges
-                }
+            records = self._execute(_GRAPH_DATA_QUERY, {'limit': int(limit)}, RoutingControl.READ)
+            
+            nodes = []
+            edges = []
+            for kind, item in self._graph_items(records):
+                (nodes if kind == 'node' else edges).append(item)
+            
+            return {
+                "nodes": nodes,
+                "edges": edges
+            }
         except Exception as e:
             logger.error(f"Error getting graph data: {str(e)}")
             return {"nodes": [], "edges": []}
+    
+    def iter_graph_data(self, limit: int = 100) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream the graph data get_graph_data returns as it arrives from the
+        server, without holding every record at once
+        
+        Args:
+            limit: Maximum number of nodes to return
+        
+        Yields:
+            ('node', node) and ('edge', edge) pairs; each node is yielded
+            before any edge that touches it
+        """
+        if not self.connected:
+            return
+        
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run(_GRAPH_DATA_QUERY, limit=int(limit))
+            yield from self._graph_items(result)
+    
+    @staticmethod
+    def _graph_items(records: Iterable[Record]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Convert (n, r, m) records into de-duplicated node and edge dicts"""
+        seen = set()
+        
+        def node_item(node) -> Dict[str, Any]:
+            return {
+                'id': node.element_id,
+                'label': node.get('name', 'Unknown'),
+                'type': list(node.labels)[0] if node.labels else 'Unknown',
+                'properties': dict(node)
+            }
+        
+        for record in records:
+            # Process source node
+            if record['n']:
+                node_id = record['n'].element_id
+                if node_id not in seen:
+                    seen.add(node_id)
+                    yield 'node', node_item(record['n'])
+            
+            # Process relationship and target node
+            if record['r'] and record['m']:
+                target_id = record['m'].element_id
+                if target_id not in seen:
+                    seen.add(target_id)
+                    yield 'node', node_item(record['m'])
+                
+                yield 'edge', {
+                    'source': node_id,
+                    'target': target_id,
+                    'type': record['r'].type,
+                    'properties': dict(record['r'])
+                }
+    
+    def get_graph_columns(self, limit: int = 100) -> Dict[str, List[Any]]:
+        """
+        The graph slice get_graph_data returns, reduced to the columns
+        GraphVisualizer.get_graph_statistics_from_arrays takes. Only IDs, names
+        and types are sent back, not every node's and relationship's properties
+        
+        Args:
+            limit: Maximum number of nodes to start from, as for get_graph_data
+        
+        Returns:
+            Dictionary with node_labels, node_types, edge_source, edge_target
+            and edge_types (edge endpoints are positions in the node columns)
+        """
+        columns = {'node_labels': [], 'node_types': [],
+                   'edge_source': [], 'edge_target': [], 'edge_types': []}
+        if not self.connected:
+            return columns
+        
+        try:
+            query = """
+            MATCH (n)
+            WITH n LIMIT $limit
+            OPTIONAL MATCH (n)-[r]->(m)
+            RETURN elementId(n) AS n_id, coalesce(n.name, 'Unknown') AS n_name,
+                   coalesce(labels(n)[0], 'Unknown') AS n_type,
+                   elementId(m) AS m_id, coalesce(m.name, 'Unknown') AS m_name,
+                   coalesce(labels(m)[0], 'Unknown') AS m_type, type(r) AS r_type
+            """
+            records = self._execute(query, {'limit': int(limit)}, RoutingControl.READ)
+            
+            positions = {}
+            
+            def position(node_id: str, name: str, node_type: str) -> int:
+                index = positions.get(node_id)
+                if index is None:
+                    index = positions[node_id] = len(positions)
+                    columns['node_labels'].append(name)
+                    columns['node_types'].append(node_type)
+                return index
+            
+            for record in records:
+                source = position(record['n_id'], record['n_name'], record['n_type'])
+                if record['r_type'] is not None:
+                    columns['edge_source'].append(source)
+                    columns['edge_target'].append(
+                        position(record['m_id'], record['m_name'], record['m_type'])
+                    )
+                    columns['edge_types'].append(record['r_type'])
+            return columns
+        except Exception as e:
+            logger.error(f"Error getting graph columns: {str(e)}")
+            return {key: [] for key in columns}
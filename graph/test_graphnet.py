@@ -3,10 +3,49 @@ Test script for GraphNet application.
 Tests core functionality without the UI.
 """
 
+import io
 import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from main import GraphNet
 from config import config
 
+
+class ThreadBufferedStdout:
+    """sys.stdout stand-in that gives each capturing thread its own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self, func, *args):
+        """Run func, returning its result and everything it printed from this thread"""
+        self._local.buffer = io.StringIO()
+        result = None
+        try:
+            result = func(*args)
+        except Exception as e:
+            print_error(f"{func.__name__} error: {str(e)}")
+        finally:
+            output = self._local.buffer.getvalue()
+            del self._local.buffer
+        return result, output
+
+    def run(self, func, *args):
+        """Run func, writing its printed output out in one piece"""
+        result, output = self.capture(func, *args)
+        self.stream.write(output)
+        self.stream.flush()
+        return result
+
+    def write(self, text):
+        return getattr(self._local, 'buffer', self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
 def print_header(text):
     """Print formatted header"""
     print("\n" + "=" * 60)
@@ -79,20 +118,24 @@ def test_document_processing(graphnet):
     The product uses machine learning to analyze customer data.
     """
     
-    # Save to test file
-    test_file = "test_document.txt"
-    with open(test_file, 'w') as f:
+    # Save to a temp file, outside the working directory
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
         f.write(test_text)
+        test_file = f.name
     
     print_info(f"Created test document: {test_file}")
     
     # Process the document
     print_info("Processing document...")
-    result = graphnet.process_document(
-        file_path=test_file,
-        file_extension=".txt",
-        filename="test_document.txt"
-    )
+    try:
+        result = graphnet.process_document(
+            file_path=test_file,
+            file_extension=".txt",
+            filename="test_document.txt"
+        )
+    finally:
+        # Clean up
+        os.unlink(test_file)
     
     if result.get('success'):
         print_success("Document processed successfully")
@@ -103,10 +146,6 @@ def test_document_processing(graphnet):
     else:
         print_error(f"Document processing failed: {result.get('error')}")
     
-    # Clean up
-    if os.path.exists(test_file):
-        os.remove(test_file)
-    
     return result.get('success', False)
 
 def test_querying(graphnet):
@@ -195,35 +234,45 @@ def test_export(graphnet):
     
     try:
         print_info("Exporting graph to JSON...")
-        filename = graphnet.export_graph("test_export.json")
-        
-        if os.path.exists(filename):
-            print_success(f"Graph exported: {filename}")
-            
-            # Check file size
-            size = os.path.getsize(filename)
-            print_info(f"File size: {size} bytes")
+        with tempfile.TemporaryDirectory() as export_dir:
+            filename = graphnet.export_graph(os.path.join(export_dir, "test_export.json"))
             
-            # Clean up
-            os.remove(filename)
-            print_info("Test export file removed")
-        else:
-            print_error("Export file not created")
+            try:
+                # Check file size (a missing file raises here)
+                size = os.path.getsize(filename)
+            except OSError:
+                print_error("Export file not created")
+            else:
+                print_success(f"Graph exported: {filename}")
+                print_info(f"File size: {size} bytes")
+        print_info("Test export file removed")
     except Exception as e:
         print_error(f"Export failed: {str(e)}")
 
 def run_all_tests():
     """Run all tests"""
+    # Each test's output is buffered and written in one piece rather than
+    # as a write per print
+    stdout = ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        _run_all_tests(stdout)
+    finally:
+        sys.stdout = stdout.stream
+        stdout.stream.flush()
+
+def _run_all_tests(stdout):
+    """Run all tests, with output routed through stdout"""
     print_header("GraphNet Test Suite")
     print_info("Starting comprehensive tests...")
     
     # Test configuration
-    if not test_configuration():
+    if not stdout.run(test_configuration):
         print_error("Configuration test failed. Please fix configuration before proceeding.")
         return
     
     # Initialize GraphNet
-    graphnet = test_initialization()
+    graphnet = stdout.run(test_initialization)
     
     if not graphnet:
         print_error("Initialization failed. Cannot proceed with tests.")
@@ -232,21 +281,18 @@ def run_all_tests():
     # Run tests
     try:
         # Document processing
-        doc_success = test_document_processing(graphnet)
-        
-        # Only run query tests if documents were processed
-        if doc_success:
-            test_querying(graphnet)
-            test_search(graphnet)
-        
-        # Graph statistics
-        test_graph_stats(graphnet)
+        doc_success = stdout.run(test_document_processing, graphnet)
         
-        # Visualization
-        test_visualization(graphnet)
+        # The remaining tests only read the graph, so they run concurrently;
+        # each one's output is buffered and printed in this fixed order.
+        # Query tests only run if documents were processed
+        read_tests = [test_querying, test_search] if doc_success else []
+        read_tests += [test_graph_stats, test_visualization, test_export]
         
-        # Export
-        test_export(graphnet)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(stdout.capture, test, graphnet) for test in read_tests]
+            for future in futures:
+                stdout.stream.write(future.result()[1])
         
         print_header("Test Suite Complete")
         print_success("All tests completed!")
@@ -3,37 +3,225 @@ Visualizer module for GraphNet.
 Handles graph visualization using PyVis and network diagrams.
 """
 
+import hashlib
+import heapq
+import importlib.metadata
 import logging
-from typing import Dict, Any, List
-from pyvis.network import Network
-import networkx as nx
+import os
+import shutil
+import tempfile
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
 import json
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON serialization for exports
+    orjson = None
 from config import config
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+if TYPE_CHECKING:
+    # pyvis (and Jinja2 behind it) is only imported once a network is built
+    from pyvis.network import Network
+
 logger = logging.getLogger(__name__)
 
+# Rendered visualizations are cached here, keyed by a hash of the graph data
+# and of everything else that shapes the page. Bump _HTML_RENDER_VERSION
+# whenever create_network's output changes so stale pages aren't served
+_HTML_CACHE_DIR = Path(tempfile.gettempdir()) / "graphnet-viz-cache"
+_HTML_RENDER_VERSION = 1
+
+# Background writes of rendered pages (cache entries, save_html_async), so
+# callers don't wait on disk for files they won't read right away
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="graphnet-viz")
+
+# get_graph_statistics results remembered per visualizer when VIZ_STATS_CACHE
+# is set, keyed by a digest of the graph data. Digesting costs most of what
+# computing the stats does, so it only pays off when the same data is asked
+# for repeatedly; without orjson the digest costs more and is never used
+_STATS_CACHE_SIZE = 32
+
+# Tooltips are embedded in the page for every node and edge, so property
+# values are trimmed: long strings cut, big collections and vectors dropped
+_TOOLTIP_MAX_CHARS = 120
+_TOOLTIP_MAX_ITEMS = 10
+_TOOLTIP_SKIP_KEYS = frozenset({'embedding', 'vector'})
+_NODE_TOOLTIP_SKIP_KEYS = _TOOLTIP_SKIP_KEYS | {'name', 'id'}
+
+# Graphs with at least this many nodes are laid out once in Python (NetworkX
+# spring layout) and drawn with physics off, instead of settling in the browser
+_PRECOMPUTED_LAYOUT_MIN_NODES = 250
+_LAYOUT_SCALE = 1000
+# vis.js's own improvedLayout pass is slow on big graphs and redundant here
+_IMPROVED_LAYOUT_MAX_NODES = 1000
+
+# Above this many edges, edges are drawn as plain straight arrows: no label,
+# hover tooltip or per-edge font, and no curve computed per redraw
+_DENSE_EDGE_MIN = 500
+_DENSE_EDGE_OPTIONS = {
+    "smooth": False,
+    "arrows": {"to": {"enabled": True, "scaleFactor": 0.5}}
+}
+
+# vis.js options for every network; read-only once built (see _network_options)
+_NETWORK_OPTIONS = {
+    "physics": {
+        "enabled": True,
+        "barnesHut": {
+            "gravitationalConstant": -30000,
+            "centralGravity": 0.3,
+            "springLength": 200,
+            "springConstant": 0.04,
+            "damping": 0.09
+        },
+        "stabilization": {
+            "enabled": True,
+            "iterations": 100
+        }
+    },
+    "interaction": {
+        "hover": True,
+        "navigationButtons": True,
+        "keyboard": True,
+        # Redraw only nodes while panning/zooming; edges dominate draw time
+        "hideEdgesOnDrag": True,
+        "hideNodesOnDrag": False
+    },
+    # vis.js defaults to 'dynamic' smoothing, which adds a hidden physics
+    # node per edge; 'continuous' curves are computed at draw time instead
+    "edges": {
+        "smooth": {"type": "continuous"}
+    }
+}
+
+
+@lru_cache(maxsize=None)
+def _stabilized_options(iterations: int, physics: bool) -> Dict[str, Any]:
+    """_NETWORK_OPTIONS with the given stabilization budget; shared and read-only"""
+    options = dict(_NETWORK_OPTIONS)
+    options["physics"] = dict(
+        _NETWORK_OPTIONS["physics"],
+        enabled=physics,
+        stabilization={"enabled": iterations > 0, "iterations": iterations}
+    )
+    return options
+
+
+def _network_options(node_count: int) -> Dict[str, Any]:
+    """
+    Options sized to the graph: small subgraphs settle with little or no
+    stabilization, and one or two nodes skip the physics simulation entirely
+    """
+    if node_count < 10:
+        iterations = 0
+    elif node_count < 100:
+        iterations = 50
+    else:
+        iterations = _NETWORK_OPTIONS["physics"]["stabilization"]["iterations"]
+    return _stabilized_options(iterations, node_count > 2)
+
+
+@lru_cache(maxsize=None)
+def _precomputed_layout_options(improved_layout: bool) -> Dict[str, Any]:
+    """_NETWORK_OPTIONS for nodes placed in Python: no physics or stabilization"""
+    options = dict(_stabilized_options(0, False))
+    options["layout"] = {"improvedLayout": improved_layout}
+    return options
+
+
+def _precompute_layout(node_ids: List[str],
+                       links: List[Tuple[str, str]]) -> Optional[Dict[str, Tuple[float, float]]]:
+    """
+    Spring-layout positions scaled to vis.js canvas units, or None when
+    NetworkX can't lay out a graph this size (500+ nodes need SciPy)
+    """
+    import networkx as nx
+    
+    graph = nx.Graph()
+    graph.add_nodes_from(node_ids)
+    graph.add_edges_from(links)
+    try:
+        positions = nx.spring_layout(graph, seed=42, iterations=50)
+    except ImportError as e:
+        logger.warning(f"Falling back to in-browser layout: {str(e)}")
+        return None
+    return {
+        node_id: (float(x) * _LAYOUT_SCALE, float(y) * _LAYOUT_SCALE)
+        for node_id, (x, y) in positions.items()
+    }
+
+
+def _dumps_sorted(obj: Any, **kwargs) -> str:
+    """Jinja's tojson serializer (json.dumps with sort_keys) done by orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _pyvis_version() -> str:
+    """Installed PyVis version; its template is part of every rendered page"""
+    try:
+        return importlib.metadata.version("pyvis")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _render_options() -> str:
+    """Everything besides the graph data that changes the rendered page"""
+    return (f"{_HTML_RENDER_VERSION}|{_pyvis_version()}|{orjson is not None}"
+            f"|{config.GRAPH_HEIGHT}|{config.GRAPH_WIDTH}")
+
+
+@lru_cache(maxsize=None)
+def _template_env(template_dir: str):
+    """
+    One Jinja environment per PyVis template directory, shared by every
+    network. PyVis creates a fresh environment per Network, so every page
+    recompiled template.html (~10ms); a shared one compiles it once. With
+    orjson, the node and edge lists behind the template's tojson filter are
+    serialized by it too (still key-sorted and HTML-escaped by Jinja).
+    """
+    from jinja2 import Environment, FileSystemLoader
+    
+    env = Environment(loader=FileSystemLoader(template_dir))
+    if orjson:
+        env.policies['json.dumps_function'] = _dumps_sorted
+        env.policies['json.dumps_kwargs'] = {}
+    return env
+
 
 class GraphVisualizer:
     """Visualize knowledge graphs using PyVis"""
     
+    # Node type -> color; shared read-only by every instance
+    _COLORS = MappingProxyType({
+        'Person': '#FF6B6B',
+        'Organization': '#4ECDC4',
+        'Location': '#45B7D1',
+        'Concept': '#FFA07A',
+        'Product': '#98D8C8',
+        'Date': '#F7DC6F',
+        'Event': '#BB8FCE',
+        'Technology': '#85C1E2',
+        'Other': '#BDC3C7'
+    })
+    # Same mapping with unknown types falling back to 'Other'
+    _color_lut = defaultdict(lambda other=_COLORS['Other']: other, _COLORS)
+    
     def __init__(self):
         """Initialize the graph visualizer"""
-        self.colors = {
-            'Person': '#FF6B6B',
-            'Organization': '#4ECDC4',
-            'Location': '#45B7D1',
-            'Concept': '#FFA07A',
-            'Product': '#98D8C8',
-            'Date': '#F7DC6F',
-            'Event': '#BB8FCE',
-            'Technology': '#85C1E2',
-            'Other': '#BDC3C7'
-        }
+        self.colors = self._COLORS
+        # LRU cache of get_graph_statistics results, keyed by graph data digest
+        self._stats_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
     
     def create_network(self, graph_data: Dict[str, Any], 
-                      height: str = None, width: str = None) -> Network:
+                      height: str = None, width: str = None,
+                      precomputed_layout: Optional[bool] = None) -> "Network":
         """
         Create a PyVis network from graph data
         
@@ -41,10 +229,14 @@ class GraphVisualizer:
             graph_data: Dictionary containing nodes and edges
             height: Height of the visualization
             width: Width of the visualization
+            precomputed_layout: Place nodes in Python and turn physics off;
+                by default only for graphs of _PRECOMPUTED_LAYOUT_MIN_NODES+ nodes
         
         Returns:
             PyVis Network object
         """
+        from pyvis.network import Network
+        
         height = height or config.GRAPH_HEIGHT
         width = width or config.GRAPH_WIDTH
         
@@ -54,69 +246,92 @@ class GraphVisualizer:
             width=width,
             bgcolor='#222222',
             font_color='white',
-            directed=True
+            directed=True,
+            # vis.js is loaded from the CDN either way; 'local' (the default)
+            # also copies PyVis's lib/ tree into the working directory
+            cdn_resources='remote'
         )
+        net.templateEnv = _template_env(net.template_dir)
         
-        # Configure physics
-        net.set_options("""
-        {
-          "physics": {
-            "enabled": true,
-            "barnesHut": {
-              "gravitationalConstant": -30000,
-              "centralGravity": 0.3,
-              "springLength": 200,
-              "springConstant": 0.04,
-              "damping": 0.09
-            },
-            "stabilization": {
-              "enabled": true,
-              "iterations": 100
-            }
-          },
-          "interaction": {
-            "hover": true,
-            "navigationButtons": true,
-            "keyboard": true
-          }
-        }
-        """)
+        # Configure physics. set_options would only json.loads its string
+        # into this same dict, so the pre-built one is assigned directly;
+        # PyVis (0.3) renders a dict-valued options attribute with json.dumps
+        net.options = _network_options(len(graph_data.get('nodes', [])))
         
-        # Add nodes
+        # Add nodes and edges as the option dicts add_node/add_edge would build.
+        # Those check each ID against a list of every node added so far, which
+        # is quadratic in graph size; IDs are de-duplicated with a dict here
+        node_map = net.node_map
         for node in graph_data.get('nodes', []):
-            node_type = node.get('type', 'Other')
-            color = self.colors.get(node_type, self.colors['Other'])
-            
-            title = self._create_node_tooltip(node)
-            
-            net.add_node(
-                node['id'],
-                label=node.get('label', 'Unknown'),
-                title=title,
-                color=color,
-                size=25,
-                font={'size': 14}
-            )
-        
-        # Add edges
-        for edge in graph_data.get('edges', []):
-            title = self._create_edge_tooltip(edge)
-            
-            net.add_edge(
-                edge['source'],
-                edge['target'],
-                title=title,
-                label=edge.get('type', ''),
-                color={'color': '#848484'},
-                arrows='to',
-                font={'size': 10, 'align': 'middle'}
+            node_id = node['id']
+            if node_id in node_map:
+                continue
+            node_map[node_id] = {
+                'color': self._color_lut[node.get('type', 'Other')],
+                'title': self._create_node_tooltip(node),
+                'size': 25,
+                'font': {'color': net.font_color},
+                'id': node_id,
+                'label': node.get('label', 'Unknown') or node_id,
+                'shape': 'dot'
+            }
+        net.nodes.extend(node_map.values())
+        net.node_ids.extend(node_map)
+        
+        # Edges to nodes outside this graph data are left out
+        dense = len(graph_data.get('edges', [])) > _DENSE_EDGE_MIN
+        if dense:
+            edges = [
+                {
+                    'color': {'color': '#848484'},
+                    'from': edge['source'],
+                    'to': edge['target']
+                }
+                for edge in graph_data.get('edges', [])
+                if edge['source'] in node_map and edge['target'] in node_map
+            ]
+        else:
+            edges = [
+                {
+                    'title': self._create_edge_tooltip(edge),
+                    'label': edge.get('type', ''),
+                    'color': {'color': '#848484'},
+                    'arrows': 'to',
+                    'font': {'size': 10, 'align': 'middle'},
+                    'from': edge['source'],
+                    'to': edge['target']
+                }
+                for edge in graph_data.get('edges', [])
+                if edge['source'] in node_map and edge['target'] in node_map
+            ]
+        net.edges.extend(edges)
+        
+        if precomputed_layout is None:
+            precomputed_layout = len(node_map) >= _PRECOMPUTED_LAYOUT_MIN_NODES
+        if precomputed_layout and node_map:
+            positions = _precompute_layout(
+                list(node_map), [(edge['from'], edge['to']) for edge in edges]
             )
+            if positions is not None:
+                for node_id, (x, y) in positions.items():
+                    node = node_map[node_id]
+                    node['x'] = x
+                    node['y'] = y
+                    node['physics'] = False
+                net.options = _precomputed_layout_options(
+                    len(node_map) <= _IMPROVED_LAYOUT_MAX_NODES
+                )
+        
+        if dense:
+            # The option dicts above are shared, so this one gets a copy
+            net.options = dict(net.options, edges=_DENSE_EDGE_OPTIONS)
         
         return net
     
     def _create_node_tooltip(self, node: Dict[str, Any]) -> str:
         """
-        Create HTML tooltip for a node
+        Create HTML tooltip for a node (property values are truncated, see
+        _tooltip_properties)
         
         Args:
             node: Node data
@@ -126,19 +341,19 @@ class GraphVisualizer:
         """
         properties = node.get('properties', {})
         
-        tooltip = f"<b>{node.get('label', 'Unknown')}</b><br>"
-        tooltip += f"<i>Type: {node.get('type', 'Unknown')}</i><br><br>"
+        # Header as one f-string (str.format templates are ~3x slower)
+        header = (f"<b>{node.get('label', 'Unknown')}</b><br>"
+                  f"<i>Type: {node.get('type', 'Unknown')}</i><br><br>")
+        if not properties:
+            return header
         
         # Add properties
-        for key, value in properties.items():
-            if key not in ['name', 'id']:
-                tooltip += f"{key}: {value}<br>"
-        
-        return tooltip
+        return header + ''.join(self._tooltip_properties(properties, _NODE_TOOLTIP_SKIP_KEYS))
     
     def _create_edge_tooltip(self, edge: Dict[str, Any]) -> str:
         """
-        Create HTML tooltip for an edge
+        Create HTML tooltip for an edge (property values are truncated, see
+        _tooltip_properties)
         
         Args:
             edge: Edge data
@@ -148,15 +363,36 @@ class GraphVisualizer:
         """
         properties = edge.get('properties', {})
         
-        tooltip = f"<b>{edge.get('type', 'Unknown')}</b><br>"
+        header = f"<b>{edge.get('type', 'Unknown')}</b><br>"
+        if not properties:
+            return header
         
         # Add properties
+        return header + ''.join(self._tooltip_properties(properties, _TOOLTIP_SKIP_KEYS))
+    
+    @staticmethod
+    def _tooltip_properties(properties: Dict[str, Any], skip_keys: frozenset) -> Iterator[str]:
+        """
+        Yield one tooltip line per property worth showing: empty values,
+        embedding vectors and collections over _TOOLTIP_MAX_ITEMS items are
+        skipped, floats are shown to 4 significant digits and anything longer
+        than _TOOLTIP_MAX_CHARS characters is cut short
+        """
         for key, value in properties.items():
-            tooltip += f"{key}: {value}<br>"
-        
-        return tooltip
+            if key in skip_keys or value is None or value == '':
+                continue
+            if isinstance(value, (list, tuple, set, dict)):
+                if not value or len(value) > _TOOLTIP_MAX_ITEMS:
+                    continue
+            if isinstance(value, float):
+                text = f"{value:.4g}"
+            else:
+                text = str(value)
+                if len(text) > _TOOLTIP_MAX_CHARS:
+                    text = text[:_TOOLTIP_MAX_CHARS] + "…"
+            yield f"{key}: {text}<br>"
     
-    def save_html(self, net: Network, filename: str = "graph.html") -> str:
+    def save_html(self, net: "Network", filename: str = "graph.html") -> str:
         """
         Save network visualization to HTML file
         
@@ -167,14 +403,104 @@ class GraphVisualizer:
         Returns:
             Path to saved file
         """
+        # The page is rendered in memory and written with a single call
+        return self._write_html(net.generate_html(), filename)
+    
+    def save_html_async(self, net: "Network", filename: str = "graph.html") -> "Future[str]":
+        """
+        Save network visualization to HTML file on a background thread
+        
+        Args:
+            net: PyVis Network object; must not be modified until the save is done
+            filename: Output filename
+        
+        Returns:
+            Future resolving to the path of the saved file
+        """
+        return _IO_EXECUTOR.submit(self.save_html, net, filename)
+    
+    @staticmethod
+    def _write_html(html: str, filename: str) -> str:
+        """Write rendered HTML to filename"""
         try:
-            net.save_graph(filename)
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(html)
             logger.info(f"Graph visualization saved to {filename}")
             return filename
         except Exception as e:
             logger.error(f"Error saving visualization: {str(e)}")
             raise
     
+    @staticmethod
+    def _write_html_cache(html: str, cache_file: Path):
+        """Store rendered HTML in the cache, atomically so readers never see a partial page"""
+        try:
+            _HTML_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=_HTML_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, cache_file)
+            GraphVisualizer._prune_html_cache()
+        except OSError as e:
+            logger.warning(f"Could not write visualization cache: {str(e)}")
+    
+    @staticmethod
+    def _prune_html_cache():
+        """Drop the least recently used pages beyond VIZ_HTML_CACHE_MAX_FILES"""
+        entries = []
+        for path in _HTML_CACHE_DIR.glob("*.html"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                pass  # Removed by another writer
+        excess = len(entries) - max(config.VIZ_HTML_CACHE_MAX_FILES, 0)
+        if excess <= 0:
+            return
+        for _, path in heapq.nsmallest(excess, entries):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    
+    def render_html(self, graph_data: Dict[str, Any], filename: str = "graph.html") -> str:
+        """
+        Build and save the visualization for graph data, reusing the saved HTML
+        when the same data has been rendered before
+        
+        Args:
+            graph_data: Dictionary containing nodes and edges
+            filename: Output filename
+        
+        Returns:
+            Path to saved file
+        """
+        cache_file = _HTML_CACHE_DIR / f"{self._html_cache_key(graph_data)}.html"
+        try:
+            shutil.copyfile(cache_file, filename)
+            os.utime(cache_file)  # Mark as recently used for pruning
+            logger.info(f"Reused cached visualization for {filename}")
+            return filename
+        except OSError:
+            pass
+        
+        # The caller reads filename straight away, so only the cache entry is
+        # written in the background
+        html = self.create_network(graph_data).generate_html()
+        self._write_html(html, filename)
+        _IO_EXECUTOR.submit(self._write_html_cache, html, cache_file)
+        return filename
+    
+    @staticmethod
+    def _html_cache_key(graph_data: Dict[str, Any]) -> str:
+        """Hash graph data (ignoring key order) and the render options into a cache key"""
+        if orjson:
+            payload = orjson.dumps(graph_data, default=str, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(graph_data, default=str, sort_keys=True).encode("utf-8")
+        hasher = hashlib.blake2b(payload, digest_size=16)
+        hasher.update(_render_options().encode("utf-8"))
+        return hasher.hexdigest()
+    
     def create_subgraph(self, graph_data: Dict[str, Any], 
                        entity_names: List[str]) -> Dict[str, Any]:
         """
@@ -187,29 +513,26 @@ class GraphVisualizer:
         Returns:
             Filtered graph data
         """
-        # Find nodes matching entity names
-        selected_nodes = []
-        selected_node_ids = set()
-        
-        for node in graph_data.get('nodes', []):
-            if node.get('label') in entity_names:
-                selected_nodes.append(node)
-                selected_node_ids.add(node['id'])
+        # Find nodes matching entity names, indexing every node by ID on the way
+        wanted = set(entity_names)
+        id_to_node = {node['id']: node for node in graph_data.get('nodes', [])}
+        selected_nodes = [node for node in id_to_node.values() if node.get('label') in wanted]
+        selected_node_ids = {node['id'] for node in selected_nodes}
         
         # Find edges connected to selected nodes
-        selected_edges = []
-        additional_node_ids = set()
-        
-        for edge in graph_data.get('edges', []):
-            if edge['source'] in selected_node_ids or edge['target'] in selected_node_ids:
-                selected_edges.append(edge)
-                additional_node_ids.add(edge['source'])
-                additional_node_ids.add(edge['target'])
-        
-        # Add connected nodes
-        for node in graph_data.get('nodes', []):
-            if node['id'] in additional_node_ids and node['id'] not in selected_node_ids:
-                selected_nodes.append(node)
+        selected_edges = [
+            edge for edge in graph_data.get('edges', [])
+            if edge['source'] in selected_node_ids or edge['target'] in selected_node_ids
+        ]
+        
+        # Add connected nodes, in the order they appear in the graph data
+        neighbor_ids = set(chain.from_iterable(
+            (edge['source'], edge['target']) for edge in selected_edges
+        ))
+        neighbor_ids -= selected_node_ids
+        selected_nodes.extend(
+            node for node in id_to_node.values() if node['id'] in neighbor_ids
+        )
         
         return {
             'nodes': selected_nodes,
@@ -226,56 +549,112 @@ class GraphVisualizer:
         Returns:
             Dictionary with statistics
         """
+        if not config.VIZ_STATS_CACHE or orjson is None:
+            return self._compute_graph_statistics(graph_data)
+        
+        # The full data is digested; a sample would miss changes further in
+        digest = hashlib.blake2b(orjson.dumps(graph_data, default=str), digest_size=16).digest()
+        cached = self._stats_cache.get(digest)
+        if cached is not None:
+            self._stats_cache.move_to_end(digest)
+            return dict(cached)
+        
+        stats = self._compute_graph_statistics(graph_data)
+        self._stats_cache[digest] = stats
+        if len(self._stats_cache) > _STATS_CACHE_SIZE:
+            self._stats_cache.popitem(last=False)
+        return dict(stats)
+    
+    def _compute_graph_statistics(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        """get_graph_statistics without the cache"""
         nodes = graph_data.get('nodes', [])
         edges = graph_data.get('edges', [])
         
-        # Count node types
-        node_type_counts = {}
-        for node in nodes:
-            node_type = node.get('type', 'Other')
-            node_type_counts[node_type] = node_type_counts.get(node_type, 0) + 1
-        
-        # Count relationship types
-        edge_type_counts = {}
-        for edge in edges:
-            edge_type = edge.get('type', 'Unknown')
-            edge_type_counts[edge_type] = edge_type_counts.get(edge_type, 0) + 1
-        
-        # Create NetworkX graph for centrality calculations
-        G = nx.DiGraph()
-        
-        for node in nodes:
-            G.add_node(node['id'], **node)
-        
-        for edge in edges:
-            G.add_edge(edge['source'], edge['target'], **edge)
-        
-        # Calculate degree centrality
-        if len(G.nodes()) > 0:
-            centrality = nx.degree_centrality(G)
-            top_nodes = sorted(centrality.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Count node and relationship types (Counter tallies in C)
+        node_type_counts = Counter(node.get('type', 'Other') for node in nodes)
+        edge_type_counts = Counter(edge.get('type', 'Unknown') for edge in edges)
+        
+        # Degree centrality is degree / (N - 1); count degrees straight from the
+        # edges. Zero-seeded in node order so isolated nodes still rank, and
+        # parallel edges count once, as they would in a simple digraph
+        id_to_label = {node['id']: node.get('label', 'Unknown') for node in nodes}
+        degrees = Counter(dict.fromkeys(id_to_label, 0))
+        degrees.update(chain.from_iterable({(edge['source'], edge['target']) for edge in edges}))
+        
+        if degrees:
+            # NetworkX scores a lone node as 1
+            scale = 1.0 / (len(degrees) - 1) if len(degrees) > 1 else None
+            top_nodes = heapq.nlargest(5, degrees.items(), key=itemgetter(1))
             
             # Map back to node labels
-            top_entities = []
-            for node_id, score in top_nodes:
-                node_label = None
-                for node in nodes:
-                    if node['id'] == node_id:
-                        node_label = node.get('label', 'Unknown')
-                        break
-                top_entities.append({'name': node_label, 'centrality': round(score, 3)})
+            top_entities = [
+                {'name': id_to_label.get(node_id, 'Unknown'),
+                 'centrality': round(degree * scale, 3) if scale else 1.0}
+                for node_id, degree in top_nodes
+            ]
         else:
             top_entities = []
         
         return {
             'total_nodes': len(nodes),
             'total_edges': len(edges),
-            'node_types': node_type_counts,
-            'relationship_types': edge_type_counts,
+            'node_types': dict(node_type_counts),
+            'relationship_types': dict(edge_type_counts),
             'top_entities': top_entities,
             'avg_degree': round(2 * len(edges) / len(nodes), 2) if len(nodes) > 0 else 0
         }
     
+    def get_graph_statistics_from_arrays(self, node_labels: Sequence[str], node_types: Sequence[str],
+                                         edge_source: Sequence[int], edge_target: Sequence[int],
+                                         edge_types: Sequence[str]) -> Dict[str, Any]:
+        """
+        Calculate the same statistics as get_graph_statistics for graph data
+        held in columns, computing degrees with numpy instead of per-edge dicts
+        
+        Args:
+            node_labels: Label of each node
+            node_types: Type of each node
+            edge_source: Position (in the node columns) of each edge's source
+            edge_target: Position of each edge's target
+            edge_types: Type of each edge
+        
+        Returns:
+            Dictionary with statistics
+        """
+        import numpy as np
+        
+        node_count = len(node_labels)
+        edge_count = len(edge_types)
+        
+        top_entities = []
+        if node_count > 0:
+            # Encode (source, target) as one int so parallel edges count once
+            links = np.unique(
+                np.asarray(edge_source, dtype=np.int64) * node_count
+                + np.asarray(edge_target, dtype=np.int64)
+            )
+            degrees = np.bincount(
+                np.concatenate([links // node_count, links % node_count]), minlength=node_count
+            )
+            # Stable, so ties keep node order as heapq.nlargest does
+            top_nodes = np.argsort(-degrees, kind='stable')[:5].tolist()
+            
+            scale = 1.0 / (node_count - 1) if node_count > 1 else None
+            top_entities = [
+                {'name': node_labels[i],
+                 'centrality': round(int(degrees[i]) * scale, 3) if scale else 1.0}
+                for i in top_nodes
+            ]
+        
+        return {
+            'total_nodes': node_count,
+            'total_edges': edge_count,
+            'node_types': dict(Counter(node_types)),
+            'relationship_types': dict(Counter(edge_types)),
+            'top_entities': top_entities,
+            'avg_degree': round(2 * edge_count / node_count, 2) if node_count > 0 else 0
+        }
+    
     def export_to_json(self, graph_data: Dict[str, Any], filename: str = "graph.json") -> str:
         """
         Export graph data to JSON file
@@ -288,10 +667,83 @@ class GraphVisualizer:
             Path to saved file
         """
         try:
-            with open(filename, 'w') as f:
-                json.dump(graph_data, f, indent=2)
+            if orjson:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(graph_data, option=orjson.OPT_INDENT_2))
+            else:
+                # One write of the finished string; json.dump issues a write per token
+                with open(filename, 'w') as f:
+                    f.write(json.dumps(graph_data, indent=2))
             logger.info(f"Graph data exported to {filename}")
             return filename
         except Exception as e:
             logger.error(f"Error exporting graph data: {str(e)}")
             raise
+
+    def export_items_to_json(self, items: Iterable[Tuple[str, Dict[str, Any]]],
+                             filename: str = "graph.json") -> str:
+        """
+        Export streamed graph data (('node', dict) / ('edge', dict) pairs, see
+        GraphManager.iter_graph_data) to a JSON file laid out as export_to_json's,
+        writing each item as it arrives. Edges are spooled to a temporary file
+        until the nodes are done, so neither list is held in memory
+        
+        Args:
+            items: Node and edge pairs, in any interleaving
+            filename: Output filename
+        
+        Returns:
+            Path to saved file
+        """
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f, \
+                    tempfile.TemporaryFile('w+', encoding='utf-8') as spooled_edges:
+                out = {'node': f, 'edge': spooled_edges}
+                first = {'node': True, 'edge': True}
+                f.write('{\n  "nodes": [')
+                for kind, item in items:
+                    # Items sit two levels deep, as they would under indent=2
+                    text = self._json_item(item).replace('\n', '\n    ')
+                    out[kind].write(('\n    ' if first[kind] else ',\n    ') + text)
+                    first[kind] = False
+                f.write('' if first['node'] else '\n  ')
+                f.write('],\n  "edges": [')
+                spooled_edges.seek(0)
+                shutil.copyfileobj(spooled_edges, f)
+                f.write('' if first['edge'] else '\n  ')
+                f.write(']\n}')
+            # Readers never see a half-written export
+            os.replace(tmp_path, filename)
+            logger.info(f"Graph data exported to {filename}")
+            return filename
+        except Exception as e:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            logger.error(f"Error exporting graph data: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _json_item(item: Dict[str, Any]) -> str:
+        """One node or edge as indented JSON"""
+        if orjson:
+            return orjson.dumps(item, option=orjson.OPT_INDENT_2).decode('utf-8')
+        return json.dumps(item, indent=2)
+
+    def export_to_bytes(self, graph_data: Dict[str, Any]) -> bytes:
+        """
+        Serialize graph data to compact JSON bytes without touching disk
+        
+        Args:
+            graph_data: Graph data
+        
+        Returns:
+            UTF-8 encoded JSON
+        """
+        if orjson:
+            # orjson is several times faster on nested dicts and emits compact bytes directly
+            return orjson.dumps(graph_data)
+        return json.dumps(graph_data, separators=(",", ":")).encode("utf-8")
@@ -4,16 +4,27 @@ Core functionality for building and querying the knowledge graph.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from tqdm import tqdm
+import os
+import shutil
+import tempfile
+import threading
+from functools import cached_property
+from itertools import count
+from typing import TYPE_CHECKING, BinaryIO, List, Dict, Any, Optional, Union
 
-# Setup logging first
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Uploads up to this size are processed from memory; larger ones are spooled
+# to a temporary file in fixed-size blocks
+SPOOL_MAX_SIZE = 2 * 1024 * 1024
+SPOOL_BLOCK_SIZE = 64 * 1024
+
+# Source of GraphNet.graph_version values; process-wide, so a re-created
+# GraphNet never reuses a version an earlier instance handed out
+_GRAPH_VERSIONS = count(1)
+
 from config import config
 from ai.document_processor import DocumentProcessor
-from ai.entity_extractor import EntityExtractor, SimpleEntityExtractor
 
 # Import appropriate graph manager based on configuration
 if config.GRAPH_MODE == "neo4j":
@@ -27,9 +38,14 @@ else:
     from graph.embedded_graph_manager import EmbeddedGraphManager as GraphManager
     logger.info("Using embedded graph manager (no database needed)")
 
-from ai.query_agent import QueryAgent
 from graph.visualizer import GraphVisualizer
 
+if TYPE_CHECKING:
+    # Both pull in LangChain and the Gemini client (most of this module's
+    # import time); they are imported when first needed instead
+    from ai.entity_extractor import EntityExtractor
+    from ai.query_agent import QueryAgent
+
 
 class GraphNet:
     """
@@ -37,14 +53,42 @@ class GraphNet:
     Orchestrates document processing, entity extraction, and graph building.
     """
 
+    _instance: Optional["GraphNet"] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "GraphNet":
+        """
+        Return the process-wide GraphNet, creating it on first use; call
+        initialize() on it as usual (repeat calls are cheap)
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
     def __init__(self):
         """Initialize GraphNet components"""
         self.graph_manager = GraphManager()
-        self.entity_extractor = EntityExtractor()
-        self.query_agent = None
+        self.query_agent: Optional["QueryAgent"] = None
         self.visualizer = GraphVisualizer()
         self.document_processor = DocumentProcessor()
         self.initialized = False
+        self._init_status = None
+        # (graph version, limit, canvas size) of the last visualization written
+        self._viz_key = None
+        # Documents may be processed concurrently; extraction overlaps but
+        # graph writes are applied one document at a time
+        self._write_lock = threading.Lock()
+        # Renewed (under _write_lock) after every write to the graph, by any
+        # caller; a cache key for results derived from the whole graph
+        self.graph_version = next(_GRAPH_VERSIONS)
+
+    @cached_property
+    def entity_extractor(self) -> "EntityExtractor":
+        """The LLM entity extractor, imported and created on first use"""
+        from ai.entity_extractor import EntityExtractor
+        return EntityExtractor()
 
     def initialize(self) -> Dict[str, Any]:
         """
@@ -53,6 +97,10 @@ class GraphNet:
         Returns:
             Dictionary with initialization status
         """
+        # Already connected: reuse the connection, clients and status
+        if self.initialized and self._init_status is not None:
+            return dict(self._init_status, errors=list(self._init_status["errors"]))
+
         status = {
             "graph_manager": False,
             "entity_extractor": False,
@@ -64,6 +112,8 @@ class GraphNet:
         try:
             # Connect to Neo4j
             if self.graph_manager.connect():
+                # Index entity names before the first MERGE, not after a slow load
+                self.graph_manager.ensure_indexes()
                 status["graph_manager"] = True
                 logger.info("✓ Graph database connected")
             else:
@@ -79,6 +129,7 @@ class GraphNet:
                 logger.warning("✗ Entity extractor initialization failed - will use fallback")
 
             # Initialize query agent
+            from ai.query_agent import QueryAgent
             self.query_agent = QueryAgent(self.graph_manager)
             if self.query_agent.initialize():
                 status["query_agent"] = True
@@ -90,8 +141,9 @@ class GraphNet:
             # Check if minimum requirements are met
             status["overall"] = status["graph_manager"]
             self.initialized = status["overall"]
+            self._init_status = status
 
-            return status
+            return dict(status, errors=list(status["errors"]))
 
         except Exception as e:
             logger.error(f"Error during initialization: {str(e)}")
@@ -140,16 +192,18 @@ class GraphNet:
 
             logger.info(f"Extracted {len(text)} characters from {filename}")
 
-            # Step 2: Split text into chunks
-            chunks = self.document_processor.chunk_text(text)
-            logger.info(f"Split into {len(chunks)} chunks")
+            # Step 2: Split text into chunks (streamed lazily into the extractor)
+            chunk_count = self.document_processor.count_chunks(text)
+            logger.info(f"Split into {chunk_count} chunks")
 
             # Step 3: Extract entities and relationships
             if self.entity_extractor.initialized:
+                chunks = self.document_processor.iter_chunks(text)
                 extraction_result = self.entity_extractor.extract_from_chunks(chunks, filename)
             else:
                 # Fallback to simple extraction
                 logger.warning("Using fallback entity extraction")
+                from ai.entity_extractor import SimpleEntityExtractor
                 extraction_result = SimpleEntityExtractor.extract_basic_entities(text)
 
             entities = extraction_result.get("entities", [])
@@ -158,40 +212,45 @@ class GraphNet:
             logger.info(f"Extracted {len(entities)} entities and {len(relationships)} relationships")
 
             # Step 4: Add to graph
-            entities_added = 0
-            relationships_added = 0
-
-            # Add entities
-            for entity in tqdm(entities, desc="Adding entities"):
-                success = self.graph_manager.create_entity(
-                    entity_name=entity["name"],
-                    entity_type=entity["type"],
-                    properties={"description": entity.get("description", "")},
-                    source=filename
-                )
-                if success:
-                    entities_added += 1
-
-            # Add relationships
-            for rel in tqdm(relationships, desc="Adding relationships"):
-                success = self.graph_manager.create_relationship(
-                    source_entity=rel["source"],
-                    source_type="Entity",  # Generic type
-                    target_entity=rel["target"],
-                    target_type="Entity",
-                    relationship_type=rel["type"].replace(" ", "_").upper(),
-                    properties={"description": rel.get("description", "")}
-                )
-                if success:
-                    relationships_added += 1
+            entity_rows = [
+                {
+                    "name": entity["name"],
+                    "type": entity["type"],
+                    "properties": {"description": entity.get("description", "")},
+                    "source": filename
+                }
+                for entity in entities
+            ]
+            relationship_rows = [
+                {
+                    "source": rel["source"],
+                    "source_type": "Entity",  # Generic type
+                    "target": rel["target"],
+                    "target_type": "Entity",
+                    "type": rel["type"].replace(" ", "_").upper(),
+                    "properties": {"description": rel.get("description", "")}
+                }
+                for rel in relationships
+            ]
+
+            # One batched write (a single transaction in Neo4j) for the whole
+            # document instead of a round-trip per item
+            with self._write_lock:
+                entities_added, relationships_added = \
+                    self.graph_manager.create_entities_and_relationships(entity_rows, relationship_rows)
+                self.graph_version = next(_GRAPH_VERSIONS)
 
             logger.info(f"Added {entities_added} entities and {relationships_added} relationships to graph")
 
+            # Cached query answers may be stale now
+            if self.query_agent:
+                self.query_agent.clear_cache()
+
             return {
                 "success": True,
                 "filename": filename,
                 "text_length": len(text),
-                "chunks": len(chunks),
+                "chunks": chunk_count,
                 "entities_extracted": len(entities),
                 "relationships_extracted": len(relationships),
                 "entities_added": entities_added,
@@ -206,6 +265,37 @@ class GraphNet:
                 "error": str(e)
             }
 
+    def process_document_stream(self, file_obj: BinaryIO, file_extension: str = None,
+                                filename: str = "unknown") -> Dict[str, Any]:
+        """
+        Process a document from a readable binary stream (e.g. an upload).
+        Small files are read into memory; larger ones are copied to a temporary
+        file in SPOOL_BLOCK_SIZE blocks and processed from disk, so the full
+        content is never held as a second in-memory copy.
+
+        Args:
+            file_obj: Readable binary file-like object
+            file_extension: File extension
+            filename: Name of the file
+
+        Returns:
+            Processing results
+        """
+        head = file_obj.read(SPOOL_MAX_SIZE + 1)
+        if len(head) <= SPOOL_MAX_SIZE:
+            return self.process_document(file_bytes=head, file_extension=file_extension, filename=filename)
+
+        with tempfile.NamedTemporaryFile(suffix=file_extension or "", delete=False) as spooled:
+            spooled.write(head)
+            del head
+            shutil.copyfileobj(file_obj, spooled, SPOOL_BLOCK_SIZE)
+
+        try:
+            return self.process_document(file_path=spooled.name, file_extension=file_extension,
+                                         filename=filename)
+        finally:
+            os.unlink(spooled.name)
+
     def query(self, natural_language_query: str) -> Dict[str, Any]:
         """
         Query the knowledge graph using natural language
@@ -259,16 +349,21 @@ class GraphNet:
             Path to HTML file
         """
         try:
-            # Get graph data
-            graph_data = self.graph_manager.get_graph_data(limit=limit)
+            filename = "graph_visualization.html"
 
-            # Create visualization
-            net = self.visualizer.create_network(graph_data)
+            # Stores that track a version (embedded) let an unchanged graph
+            # skip even fetching and hashing the data
+            version = getattr(self.graph_manager, "version", None)
+            viz_key = (version, limit, config.GRAPH_HEIGHT, config.GRAPH_WIDTH)
+            if version is not None and viz_key == self._viz_key and os.path.exists(filename):
+                return filename
 
-            # Save to file
-            filename = "graph_visualization.html"
-            self.visualizer.save_html(net, filename)
+            # Get graph data
+            graph_data = self.graph_manager.get_graph_data(limit=limit)
 
+            # Create visualization (reused as-is if this data was rendered before)
+            filename = self.visualizer.render_html(graph_data, filename)
+            self._viz_key = viz_key
             return filename
 
         except Exception as e:
@@ -286,9 +381,15 @@ class GraphNet:
             # Get stats from database
             db_stats = self.graph_manager.get_graph_stats()
 
-            # Get graph data for visualization stats
-            graph_data = self.graph_manager.get_graph_data(limit=1000)
-            vis_stats = self.visualizer.get_graph_statistics(graph_data)
+            # Visualization stats over the same slice the viewer draws. Neo4j
+            # sends just the ID/name/type columns for it rather than whole
+            # nodes; the embedded store serves its cached graph data
+            if hasattr(self.graph_manager, "get_graph_columns"):
+                columns = self.graph_manager.get_graph_columns(limit=1000)
+                vis_stats = self.visualizer.get_graph_statistics_from_arrays(**columns)
+            else:
+                graph_data = self.graph_manager.get_graph_data(limit=1000)
+                vis_stats = self.visualizer.get_graph_statistics(graph_data)
 
             return {
                 "database": db_stats,
@@ -318,32 +419,51 @@ class GraphNet:
         Returns:
             Success status
         """
-        return self.graph_manager.clear_graph()
-
-    def export_graph(self, filename: str = "graph_export.json") -> str:
+        with self._write_lock:
+            success = self.graph_manager.clear_graph()
+            self.graph_version = next(_GRAPH_VERSIONS)
+        if self.query_agent:
+            self.query_agent.clear_cache()
+        return success
+
+    def export_graph(self, filename: str = "graph_export.json",
+                     return_bytes: bool = False) -> Union[str, bytes]:
         """
-        Export the graph to a JSON file
+        Export the graph to a JSON file, or as in-memory JSON bytes
 
         Args:
-            filename: Output filename
+            filename: Output filename (ignored when return_bytes is set)
+            return_bytes: Return compact JSON bytes instead of writing a file
 
         Returns:
-            Path to exported file
+            Path to exported file, or the JSON bytes
         """
+        if not return_bytes and hasattr(self.graph_manager, "iter_graph_data"):
+            # Neo4j: written record by record instead of loaded whole first
+            return self.visualizer.export_items_to_json(
+                self.graph_manager.iter_graph_data(limit=10000), filename
+            )
+
         graph_data = self.graph_manager.get_graph_data(limit=10000)
+        if return_bytes:
+            return self.visualizer.export_to_bytes(graph_data)
         return self.visualizer.export_to_json(graph_data, filename)
 
     def shutdown(self):
         """Shutdown GraphNet and close connections"""
         if self.graph_manager:
             self.graph_manager.close()
+        self.initialized = False
+        self._init_status = None
         logger.info("GraphNet shutdown complete")
 
 
 # Main execution
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Initialize GraphNet
-    graphnet = GraphNet()
+    graphnet = GraphNet.get()
 
     print("=" * 60)
     print("GraphNet - AI-Powered Knowledge Graph")
@@ -0,0 +1,72 @@
+"""Tests for the in-memory graph store"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from graph.embedded_graph_manager import EmbeddedGraphManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = EmbeddedGraphManager(str(tmp_path / "graph.pkl"))
+    assert manager.connect()
+    yield manager
+    manager.close()
+
+
+def test_graph_data_is_not_changed_by_later_updates(manager):
+    manager.create_entity("Ada", "Person", {"role": "analyst"})
+    before = manager.get_graph_data()
+
+    manager.create_entity("Ada", "Person", {"role": "engineer"})
+
+    assert before["nodes"][0]["properties"]["role"] == "analyst"
+    assert manager.get_graph_data()["nodes"][0]["properties"]["role"] == "engineer"
+
+
+def test_clear_survives_a_lost_snapshot(tmp_path, monkeypatch):
+    persist_file = str(tmp_path / "graph.pkl")
+    manager = EmbeddedGraphManager(persist_file)
+    assert manager.connect()
+    manager.create_entity("Ada", "Person")
+    manager.close()
+
+    manager = EmbeddedGraphManager(persist_file)
+    assert manager.connect()
+    # The process dies before the writer thread saves the empty snapshot
+    monkeypatch.setattr(manager, "_snapshots", SimpleNamespace(
+        get_nowait=lambda: None, put_nowait=lambda snapshot: None
+    ))
+    assert manager.clear_graph()
+    manager.connected = False
+
+    reopened = EmbeddedGraphManager(persist_file)
+    assert reopened.connect()
+    assert reopened.get_graph_data()["nodes"] == []
+    reopened.close()
+
+
+def test_connect_leaves_no_log_until_the_first_write(tmp_path):
+    manager = EmbeddedGraphManager(str(tmp_path / "graph.pkl"))
+    assert manager.connect()
+    manager.get_graph_data()
+    assert list(tmp_path.iterdir()) == []
+
+    manager.create_entity("Ada", "Person")
+    assert (tmp_path / "graph.pkl.wal").exists()
+    manager.close()
+
+
+def test_relationship_rows_are_copies(manager):
+    manager.create_relationship("Ada", "Person", "Acme", "Company", "WORKS_AT")
+    rows = manager.get_entity_relationships("Ada")
+    rows[0]["entity"] = "changed"
+    rows[0]["labels"].append("changed")
+
+    assert manager.get_entity_relationships("Ada") == [{
+        "relationship": "WORKS_AT",
+        "entity": "Acme",
+        "labels": ["Company"],
+        "direction": "outgoing",
+    }]
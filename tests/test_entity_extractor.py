@@ -0,0 +1,82 @@
+"""Tests for entity extraction: the pattern-based fallback and LLM call retries"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+import ai.entity_extractor as entity_extractor
+from ai.entity_extractor import _extract_basic
+
+
+@pytest.mark.parametrize("text, org, person", [
+    ("Dr. Smith Company hired Mr. Jones.", "Smith Company", "Dr. Smith Company"),
+    ("Mr. Acme Corp", "Acme Corp", "Mr. Acme Corp"),
+    ("Prof. Jane Doe Ltd", "Jane Doe Ltd", "Prof. Jane Doe Ltd"),
+])
+def test_overlapping_matches_of_different_types_are_kept(text, org, person):
+    orgs, persons, _ = _extract_basic(text)
+    assert org in orgs
+    assert person in persons
+
+
+def test_matches_are_deduplicated_in_first_seen_order():
+    text = "Beta Inc and Alpha Corp met on 1/2/2024. Beta Inc left on March 3, 2024."
+    orgs, persons, dates = _extract_basic(text)
+    assert orgs == ["Beta Inc", "Alpha Corp"]
+    assert persons == []
+    assert dates == ["1/2/2024", "March 3, 2024"]
+
+
+class _FakeLLM:
+    """ainvoke stub that raises the given errors in turn, then answers"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(content='{"entities": [], "relationships": []}')
+
+
+def _extractor(llm):
+    from ai.entity_extractor import EntityExtractor, TokenBucket
+
+    extractor = EntityExtractor()
+    extractor.llm = llm
+    extractor._prompt_template = ChatPromptTemplate.from_messages([("user", "{context} {text}")])
+    extractor._request_limiter = TokenBucket(10_000)
+    extractor._token_limiter = TokenBucket(10_000_000)
+    return extractor
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    async def sleep(seconds):
+        pass
+    monkeypatch.setattr(entity_extractor.asyncio, "sleep", sleep)
+
+
+def test_transient_errors_are_retried(monkeypatch, no_backoff):
+    monkeypatch.setattr(entity_extractor.config, "LLM_MAX_RETRIES", 3)
+    llm = _FakeLLM(TimeoutError("timed out"))
+    result = asyncio.run(_extractor(llm)._aextract("text"))
+    assert result["success"] and llm.calls == 2
+
+
+def test_other_errors_are_not_retried(monkeypatch, no_backoff):
+    monkeypatch.setattr(entity_extractor.config, "LLM_MAX_RETRIES", 5)
+    llm = _FakeLLM(PermissionError("API key not valid"))
+    result = asyncio.run(_extractor(llm)._aextract("text"))
+    assert not result["success"] and llm.calls == 1
+
+
+def test_at_least_one_attempt_is_made(monkeypatch, no_backoff):
+    monkeypatch.setattr(entity_extractor.config, "LLM_MAX_RETRIES", 0)
+    llm = _FakeLLM()
+    result = asyncio.run(_extractor(llm)._aextract("text"))
+    assert result["success"] and llm.calls == 1
@@ -0,0 +1,126 @@
+"""Tests for QueryAgent's LLM error handling"""
+
+import pytest
+
+import ai.query_agent as query_agent
+from ai.query_agent import QueryAgent
+
+
+class _FlakyChain:
+    """Chain stub that raises the given errors in turn, then answers"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(query_agent.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(query_agent.config, "LLM_MAX_RETRIES", 3)
+
+
+@pytest.mark.skipif(query_agent.GoogleRateLimitError is None,
+                    reason="langchain-google-genai without GoogleRateLimitError")
+def test_rate_limit_is_retried():
+    chain = _FlakyChain(query_agent.GoogleRateLimitError("429 RESOURCE_EXHAUSTED"))
+    assert QueryAgent._invoke_with_retry(chain, {}) == "ok"
+    assert chain.calls == 2
+
+
+@pytest.mark.skipif(query_agent.ServerError is None,
+                    reason="langchain-google-genai without ServerError")
+def test_server_error_is_retried():
+    chain = _FlakyChain(query_agent.ServerError(503, {"error": {"message": "unavailable"}}))
+    assert QueryAgent._invoke_with_retry(chain, {}) == "ok"
+    assert chain.calls == 2
+
+
+def test_non_transient_error_is_not_retried():
+    chain = _FlakyChain(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        QueryAgent._invoke_with_retry(chain, {})
+    assert chain.calls == 1
+
+
+def test_at_least_one_attempt_is_made(monkeypatch):
+    monkeypatch.setattr(query_agent.config, "LLM_MAX_RETRIES", 0)
+    chain = _FlakyChain()
+    assert QueryAgent._invoke_with_retry(chain, {}) == "ok"
+    assert chain.calls == 1
+
+
+class _BrokenStream:
+    def stream(self, inputs):
+        raise OSError("connection reset")
+
+
+def test_explanation_falls_back_on_transport_errors():
+    agent = QueryAgent(graph_manager=None)
+    agent.initialized = True
+    agent._explain_chain = _BrokenStream()
+    agent._summary_chain = _BrokenStream()
+    rows = [{"name": "A"}, {"name": "B"}]
+    assert list(agent.stream_explanation("q", "MATCH (n) RETURN n", rows)) == ["Found 2 results"]
+    assert list(agent.stream_entity_summary("A", {}, rows)) == ["A - 2 relationships"]
+
+
+@pytest.mark.parametrize("template", [
+    "Found {missing} results",
+    "Found {0} results",
+    "Found {count.foo} results",
+    "Found {sample:d} results",
+    "Found {count[0]} results",
+    "Found {count",
+])
+def test_malformed_templates_fall_back(template):
+    assert QueryAgent._fill_template(template, [{"name": "A"}]) is None
+
+
+def test_template_is_filled():
+    assert QueryAgent._fill_template("Found {count} results", [{"name": "A"}]) == "Found 1 results"
+
+
+class _StubGraph:
+    """query_graph stub that can run a callback mid-query"""
+
+    def __init__(self, during_query=None):
+        self.during_query = during_query
+        self.calls = 0
+
+    def query_graph(self, cypher):
+        self.calls += 1
+        if self.during_query:
+            self.during_query()
+        return [{"name": "A"}]
+
+
+def _cached_agent(graph):
+    agent = QueryAgent(graph_manager=graph)
+    agent.initialized = True
+    agent._generate_plan = lambda query: ("MATCH (n) RETURN n", "Found {count} results")
+    return agent
+
+
+def test_cached_results_are_copies():
+    agent = _cached_agent(_StubGraph())
+    first = agent.process_query("who")
+    first["results"][0]["name"] = "changed"
+    first["results"].clear()
+    assert agent.process_query("who")["results"] == [{"name": "A"}]
+
+
+def test_answers_from_before_a_clear_are_not_cached():
+    graph = _StubGraph()
+    agent = _cached_agent(graph)
+    graph.during_query = agent.clear_cache  # A write lands while the query runs
+    agent.process_query("who")
+    graph.during_query = None
+    agent.process_query("who")
+    assert graph.calls == 2
@@ -0,0 +1,57 @@
+"""Tests for the graph visualizer: subgraphs and the rendered-page cache"""
+
+import os
+
+import pytest
+
+import graph.visualizer as visualizer
+from graph.visualizer import GraphVisualizer
+
+GRAPH_DATA = {
+    "nodes": [{"id": 1, "label": "Ada", "type": "Person", "properties": {}}],
+    "edges": [],
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(visualizer, "_HTML_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def test_cache_key_covers_render_version(monkeypatch):
+    key = GraphVisualizer._html_cache_key(GRAPH_DATA)
+    monkeypatch.setattr(visualizer, "_HTML_RENDER_VERSION", visualizer._HTML_RENDER_VERSION + 1)
+    assert GraphVisualizer._html_cache_key(GRAPH_DATA) != key
+
+
+def test_cache_key_covers_canvas_size(monkeypatch):
+    key = GraphVisualizer._html_cache_key(GRAPH_DATA)
+    monkeypatch.setattr(visualizer.config, "GRAPH_HEIGHT", "500px")
+    assert GraphVisualizer._html_cache_key(GRAPH_DATA) != key
+
+
+def test_cache_drops_least_recently_used_pages(cache_dir, monkeypatch):
+    monkeypatch.setattr(visualizer.config, "VIZ_HTML_CACHE_MAX_FILES", 2)
+    for age, name in enumerate(["newest", "middle", "oldest"]):
+        page = cache_dir / f"{name}.html"
+        page.write_text(name)
+        os.utime(page, (1000 - age, 1000 - age))
+
+    GraphVisualizer._write_html_cache("fresh", cache_dir / "fresh.html")
+
+    assert sorted(p.stem for p in cache_dir.glob("*.html")) == ["fresh", "newest"]
+
+
+def test_subgraph_neighbors_follow_node_order():
+    graph_data = {
+        "nodes": [{"id": f"T:{i}", "label": str(i), "type": "Thing"} for i in range(5)],
+        "edges": [
+            {"source": "T:0", "target": "T:4", "type": "R"},
+            {"source": "T:2", "target": "T:0", "type": "R"},
+            {"source": "T:3", "target": "T:1", "type": "R"},
+        ],
+    }
+    subgraph = GraphVisualizer().create_subgraph(graph_data, ["0"])
+    assert [node["id"] for node in subgraph["nodes"]] == ["T:0", "T:2", "T:4"]
+    assert len(subgraph["edges"]) == 2